@@ -0,0 +1,134 @@
+"""
+배치 생성 벤치마크 - /recipeChat/init N회 순차 호출 vs init_sessions_batch 1회
+- 로컬 stand-in: 인메모리 Qdrant + 지연시간을 흉내내는 가짜 임베딩 / LLM
+- 실제 업스트림 비용 비율은 --embed-ms, --llm-ms로 조정
+
+실행 (backend/ai_cookbook 에서, .env 필요):
+    python -m benchmarks.bench_batch --items 7 --llm-ms 800 --embed-ms 80
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from qdrant_client import QdrantClient, models
+
+from config.settings import settings
+from services.chat_service import ChatService
+from services.retrieval import QdrantRetriever
+
+FOOD_TYPES = ["김치찌개", "된장찌개", "제육볶음", "불고기", "잡채", "비빔밥", "떡볶이", "미역국", "갈비찜", "닭볶음탕"]
+DIM = 64
+
+
+class SlowEmbeddings(DeterministicFakeEmbedding):
+    """요청 1회당 고정 지연 (배치 여부와 무관)"""
+    delay: float = 0.05
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.delay)
+        return super().embed_query(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.delay)
+        return [super(SlowEmbeddings, self).embed_query(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.delay)
+        return super().embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.delay)
+        return [super(SlowEmbeddings, self).embed_query(t) for t in texts]
+
+
+class SlowChatModel(FakeListChatModel):
+    delay: float = 0.5
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        text = self.responses[0]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        # 첫 토큰까지의 지연 후 글자 단위 스트리밍
+        await asyncio.sleep(self.delay)
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+def make_service(embed_ms: float, llm_ms: float, fast_llm: Optional[BaseChatModel] = None) -> ChatService:
+    settings.semantic_cache_enabled = False  # 순수 생성 비용 비교
+    settings.speculative_finalize_enabled = False
+
+    class BenchChatService(ChatService):
+        def _init_llm(self):
+            self.llm = SlowChatModel(
+                responses=["김치찌개\n재료: 김치 200g\n만드는 방법: 1. 볶는다"], delay=llm_ms / 1000,
+            )
+            self.fast_llm = fast_llm
+
+        def _init_embeddings(self):
+            self.embeddings = SlowEmbeddings(size=DIM, delay=embed_ms / 1000)
+
+        def _init_vector_store(self):
+            self.qdrant_client = QdrantClient(":memory:")
+            self.qdrant_client.create_collection(
+                "bench", vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE)
+            )
+            emb = DeterministicFakeEmbedding(size=DIM)
+            self.qdrant_client.upload_points("bench", [
+                models.PointStruct(id=i, vector=emb.embed_query(t), payload={"page_content": f"{t} 레시피"})
+                for i, t in enumerate(FOOD_TYPES)
+            ])
+            self.retriever = QdrantRetriever(client=self.qdrant_client, collection_name="bench", embeddings=self.embeddings)
+            self.allergen_index = None
+
+    return BenchChatService()
+
+
+async def run_batch(service: ChatService, food_types: List[str]) -> List[float]:
+    start = time.perf_counter()
+    arrivals = []
+    async for _ in service.init_sessions_batch("", "", "beginner", food_types):
+        arrivals.append(time.perf_counter() - start)
+    return arrivals
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=7)
+    parser.add_argument("--embed-ms", type=float, default=80)
+    parser.add_argument("--llm-ms", type=float, default=800)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    settings.batch_concurrency = args.concurrency
+    food_types = [FOOD_TYPES[i % len(FOOD_TYPES)] for i in range(args.items)]
+    service = make_service(args.embed_ms, args.llm_ms)
+
+    start = time.perf_counter()
+    for food_type in food_types:
+        service.init_session("", "", "beginner", food_type)
+    sequential = time.perf_counter() - start
+
+    arrivals = asyncio.run(run_batch(service, food_types))
+
+    print(f"items={args.items} embed={args.embed_ms}ms llm={args.llm_ms}ms concurrency={args.concurrency}")
+    print(f"sequential /init x{args.items}: total {sequential:.2f}s")
+    print(f"batch:                first item {arrivals[0]:.2f}s, total {arrivals[-1]:.2f}s "
+          f"({sequential / arrivals[-1]:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+하이브리드 검색 벤치마크 - dense 단독 vs dense+BM25(RRF) recall / 지연시간
+- 기본: 합성 한국어 레시피 코퍼스 + 인메모리 Qdrant + 해싱 임베딩(stand-in)
+- --host 지정 시 실제 컬렉션 + Upstage 임베딩 + held-out 질의 파일 사용
+  (질의 파일: JSONL, {"query": "...", "relevant_ids": [...]})
+
+실행 (backend/ai_cookbook 에서):
+    python -m benchmarks.bench_hybrid
+    python -m benchmarks.bench_hybrid --host localhost --collection recipes --queries-file heldout.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from qdrant_client import QdrantClient, models
+
+from services.retrieval import HybridRetriever, QdrantRetriever
+from services.sparse_index import BM25Index
+
+DISHES = [
+    "김치찌개", "된장찌개", "순두부찌개", "부대찌개", "제육볶음", "오징어볶음", "닭갈비", "불고기",
+    "잡채", "비빔밥", "김밥", "떡볶이", "감자조림", "계란말이", "미역국", "육개장",
+    "갈비찜", "닭볶음탕", "콩나물국", "어묵볶음", "멸치볶음", "두부조림", "카레라이스", "토마토 스파게티",
+]
+INGREDIENTS = ["양파", "마늘", "대파", "감자", "당근", "두부", "돼지고기", "소고기", "애호박", "고추", "버섯", "계란"]
+
+
+class HashingEmbeddings:
+    """음절 unigram 해싱 임베딩 - 로컬 dense stand-in"""
+
+    def __init__(self, dim: int = 128):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for char in text.replace(" ", ""):
+            bucket = int(hashlib.md5(char.encode()).hexdigest(), 16) % self.dim
+            vector[bucket] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def build_synthetic(seed: int, variants: int) -> Tuple[QdrantClient, str, HashingEmbeddings, List[Dict]]:
+    rng = random.Random(seed)
+    embeddings = HashingEmbeddings()
+    client = QdrantClient(":memory:")
+    name = "bench_hybrid"
+    client.create_collection(
+        name, vectors_config=models.VectorParams(size=embeddings.dim, distance=models.Distance.COSINE)
+    )
+
+    points, queries = [], []
+    for dish_idx, dish in enumerate(DISHES):
+        for variant in range(variants):
+            point_id = dish_idx * variants + variant
+            items = rng.sample(INGREDIENTS, 4)
+            text = f"{dish}\n재료: {', '.join(items)}\n만드는 방법: {items[0]}를 손질하고 {items[1]}와 함께 볶는다."
+            points.append(models.PointStruct(
+                id=point_id, vector=embeddings.embed_query(text), payload={"page_content": text},
+            ))
+        # held-out 질의: 요리 이름 정확 매칭 / 재료 제외 표현
+        relevant = list(range(dish_idx * variants, (dish_idx + 1) * variants))
+        queries.append({"query": f"{dish} 레시피 알려줘", "relevant_ids": relevant})
+        queries.append({"query": f"{rng.choice(INGREDIENTS)}는 빼고 {dish} 만들어줘", "relevant_ids": relevant})
+
+    client.upload_points(name, points)
+    return client, name, embeddings, queries
+
+
+def evaluate(search, queries: List[Dict], k: int) -> Dict[str, float]:
+    latencies, recalls = [], []
+    for item in queries:
+        start = time.perf_counter()
+        docs = search(item["query"])[:k]
+        latencies.append((time.perf_counter() - start) * 1000)
+        relevant = set(item["relevant_ids"])
+        hits = len({doc.metadata.get("_id") for doc in docs} & relevant)
+        recalls.append(hits / min(len(relevant), k) if relevant else 1.0)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)],
+        "recall": statistics.mean(recalls),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--collection")
+    parser.add_argument("--queries-file")
+    parser.add_argument("--variants", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.host:
+        from langchain_upstage import UpstageEmbeddings
+        from config.settings import settings
+
+        client = QdrantClient(host=args.host, port=args.port)
+        name = args.collection
+        embeddings = UpstageEmbeddings(
+            model=settings.embedding_model,
+            api_key=settings.embedding_api_key,
+            base_url=settings.embedding_base_url,
+        )
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+    else:
+        client, name, embeddings, queries = build_synthetic(args.seed, args.variants)
+
+    start = time.perf_counter()
+    sparse = BM25Index.from_qdrant(client, name)
+    print(f"BM25 index: {len(sparse)} docs, built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'mode':<8} {'k':>3} {'p50(ms)':>9} {'p95(ms)':>9} {'recall@k':>9}")
+    for k in (3, 5, 10):
+        dense = QdrantRetriever(client=client, collection_name=name, embeddings=embeddings, k=k)
+        hybrid = HybridRetriever(dense=dense, sparse=sparse, k=k, candidates=max(2 * k, 20))
+        for mode, retriever in (("dense", dense), ("hybrid", hybrid)):
+            result = evaluate(retriever.invoke, queries, k)
+            print(f"{mode:<8} {k:>3} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['recall']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+검색 마이크로벤치마크 - Qdrant 검색 옵션별 지연시간 / recall 비교
+- 기본: 인메모리 Qdrant(:memory:)에 합성 벡터를 넣어 비교
+- --host 지정 시 로컬 Qdrant 컬렉션에서 저장된 벡터를 쿼리로 사용 (REST vs gRPC 비교 포함)
+
+실행 (backend/ai_cookbook 에서):
+    python -m benchmarks.bench_retrieval
+    python -m benchmarks.bench_retrieval --host localhost --collection recipes
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from qdrant_client import QdrantClient, models
+
+from services.retrieval import QdrantRetriever
+
+
+def build_memory_collection(dim: int, size: int, seed: int) -> Tuple[QdrantClient, str]:
+    client = QdrantClient(":memory:")
+    name = "bench_recipes"
+    client.create_collection(
+        collection_name=name,
+        vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE),
+        quantization_config=models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True),
+        ),
+    )
+    rng = random.Random(seed)
+    points = [
+        models.PointStruct(
+            id=i,
+            vector=[rng.gauss(0, 1) for _ in range(dim)],
+            payload={
+                "page_content": f"레시피 {i} " + "재료 손질 " * 40,
+                "metadata": {"title": f"요리 {i}", "ingredients": ["양파", "마늘"] * 10},
+            },
+        )
+        for i in range(size)
+    ]
+    client.upload_points(name, points)
+    return client, name
+
+
+def sample_queries(client: QdrantClient, name: str, dim: int, count: int, seed: int) -> List[List[float]]:
+    rng = random.Random(seed + 1)
+    records, _ = client.scroll(name, limit=count, with_vectors=True, with_payload=False)
+    queries = []
+    for record in records:
+        vector = record.vector if isinstance(record.vector, list) else next(iter(record.vector.values()))
+        queries.append([v + rng.gauss(0, 0.3) for v in vector])
+    while len(queries) < count:
+        queries.append([rng.gauss(0, 1) for _ in range(dim)])
+    return queries
+
+
+def run_case(retriever: QdrantRetriever, queries: List[List[float]], truth: List[List]) -> Dict[str, float]:
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        docs = retriever.search_by_vector(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        got = {doc.metadata["_id"] for doc in docs}
+        recalls.append(len(got & set(expected)) / len(expected) if expected else 1.0)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "recall": statistics.mean(recalls),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--collection")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--size", type=int, default=3000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    clients: Dict[str, QdrantClient] = {}
+    if args.host:
+        clients["rest"] = QdrantClient(host=args.host, port=args.port)
+        clients["grpc"] = QdrantClient(host=args.host, port=args.port, grpc_port=args.grpc_port, prefer_grpc=True)
+        name = args.collection
+    else:
+        clients["memory"], name = build_memory_collection(args.dim, args.size, args.seed)
+
+    base_client = next(iter(clients.values()))
+    queries = sample_queries(base_client, name, args.dim, args.queries, args.seed)
+
+    exact = QdrantRetriever(client=base_client, collection_name=name, embeddings=None, k=args.k, exact=True)
+    truth = [[doc.metadata["_id"] for doc in exact.search_by_vector(q)] for q in queries]
+
+    cases = {
+        "full_payload": {},
+        "projected_payload": {"payload_fields": ["page_content"]},
+        "ef_32": {"payload_fields": ["page_content"], "hnsw_ef": 32},
+        "ef_128": {"payload_fields": ["page_content"], "hnsw_ef": 128},
+        "score_threshold_0.2": {"payload_fields": ["page_content"], "score_threshold": 0.2},
+        "quantized_rescore": {
+            "payload_fields": ["page_content"],
+            "quantization_rescore": True,
+            "quantization_oversampling": 2.0,
+        },
+    }
+
+    print(f"{'transport':<10} {'case':<22} {'p50(ms)':>9} {'p95(ms)':>9} {'recall@k':>9}")
+    for transport, client in clients.items():
+        for case, options in cases.items():
+            retriever = QdrantRetriever(client=client, collection_name=name, embeddings=None, k=args.k, **options)
+            result = run_case(retriever, queries, truth)
+            print(
+                f"{transport:<10} {case:<22} {result['p50_ms']:>9.2f} "
+                f"{result['p95_ms']:>9.2f} {result['recall']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
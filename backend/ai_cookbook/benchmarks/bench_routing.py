@@ -0,0 +1,85 @@
+"""
+모델 라우팅 벤치마크 - 메인 모델 단독 vs 빠른 모델 라우팅
+- bench_batch의 stand-in 서비스에 지연시간이 다른 가짜 메인 / 빠른 모델을 연결
+- 레시피 요청과 짧은 추가 질문이 섞인 대화를 진행하고 경로별 통계 출력
+- --fast-fail-rate로 빠른 모델 실패를 주입해 메인 모델 fallback 확인
+
+실행 (backend/ai_cookbook 에서, .env 필요):
+    python -m benchmarks.bench_routing --main-ms 800 --fast-ms 150 --fast-fail-rate 0.2
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, List, Optional
+
+from benchmarks.bench_batch import SlowChatModel, make_service
+from config.settings import settings
+
+CONVERSATION = [
+    "좀 더 맵게 만들어줘",
+    "고마워!",
+    "두부는 몇 cm로 썰어?",
+    "양파 대신 대파 넣어도 돼?",
+    "끓이는 시간은 총 몇 분이야?",
+    "2인분으로 바꿔줘",
+    "오늘 날씨 어때?",
+    "마지막 단계 다시 설명해줘",
+]
+_rng = random.Random(0)
+
+
+class FlakyChatModel(SlowChatModel):
+    """일정 확률로 실패하는 빠른 모델"""
+    fail_rate: float = 0.0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        if _rng.random() < self.fail_rate:
+            raise RuntimeError("fast model unavailable")
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def run(fast_ms: Optional[float], main_ms: float, fail_rate: float, sessions: int) -> dict:
+    # 실서비스에서는 LLM_FAST_MODEL로 빠른 모델 지정
+    fast_llm = None
+    if fast_ms is not None:
+        fast_llm = FlakyChatModel(responses=["네, 약 3분이면 충분해요."], delay=fast_ms / 1000, fail_rate=fail_rate)
+    service = make_service(0, main_ms, fast_llm=fast_llm)
+
+    start = time.perf_counter()
+    for _ in range(sessions):
+        session_id = service.init_session("", "", "beginner", "김치찌개")["session_id"]
+        for message in CONVERSATION:
+            service.chat(session_id, message)
+    elapsed = time.perf_counter() - start
+    stats = service.get_metrics()["model_routing"]
+    service.close()
+    return {"elapsed": elapsed, "stats": stats}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--main-ms", type=float, default=800)
+    parser.add_argument("--fast-ms", type=float, default=150)
+    parser.add_argument("--fast-fail-rate", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    settings.llm_main_cost_per_1k = 1.0  # 상대 비용 비교용 (메인 = 1)
+    settings.llm_fast_cost_per_1k = 0.2
+
+    turns = args.sessions * (len(CONVERSATION) + 1)
+    baseline = run(None, args.main_ms, 0.0, args.sessions)
+    routed = run(args.fast_ms, args.main_ms, args.fast_fail_rate, args.sessions)
+
+    print(f"sessions={args.sessions} turns={turns} main={args.main_ms}ms fast={args.fast_ms}ms "
+          f"fast-fail-rate={args.fast_fail_rate}")
+    for name, result in (("main only", baseline), ("routed", routed)):
+        cost = sum(route["cost"] for route in result["stats"].values())
+        print(f"[{name}] total {result['elapsed']:.2f}s, {result['elapsed'] / turns * 1000:.0f}ms/turn, "
+              f"relative cost {cost:.3f}")
+    print(json.dumps(routed["stats"], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
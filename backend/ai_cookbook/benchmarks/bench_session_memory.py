@@ -0,0 +1,112 @@
+"""
+세션 메모리 벤치마크 - 세션 1개당 바이트 (기존 dict + ChatMessageHistory vs SessionRecord)
+- 같은 합성 대화를 두 표현으로 N개 세션에 채워 tracemalloc으로 측정
+
+실행 (backend/ai_cookbook 에서):
+    python -m benchmarks.bench_session_memory --sessions 10000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from langchain_community.chat_message_histories import ChatMessageHistory
+
+from services.session_store import ROLE_ASSISTANT, ROLE_USER, SessionRecord
+
+RECIPE_TEMPLATE = (
+    "{name}\n\n"
+    "## 재료 (2인분)\n- 김치 200g (한입 크기로 썰기)\n- 돼지고기 앞다리살 150g (2cm 두께)\n"
+    "- 두부 1/2모 (1.5cm 깍둑썰기)\n- 대파 1대 (어슷썰기)\n- 고춧가루 1큰술, 다진 마늘 1큰술\n\n"
+    "## 만드는 방법\n1. 냄비에 식용유 1큰술을 두르고 돼지고기를 중불에서 3분간 볶습니다.\n"
+    "2. 김치를 넣고 5분간 더 볶아 신맛을 날려줍니다.\n3. 물 500ml를 붓고 센 불에서 끓어오르면 중불로 줄여 15분 끓입니다.\n"
+    "4. 두부와 대파를 넣고 3분 더 끓인 뒤 간을 봅니다.\n\n"
+    "## 팁\n- {tip}\n"
+)
+TIPS = ["김치가 덜 익었다면 설탕을 조금 넣어 주세요.", "참치를 넣으면 감칠맛이 살아나요.", "라면 사리를 넣어도 좋아요."]
+QUESTIONS = ["좀 더 맵게 해줘", "양파는 빼고 만들어줘", "2인분으로 바꿔줘", "더 간단하게 알려줘"]
+
+
+def build_conversation(rng: random.Random, session_idx: int, turns: int) -> List[Tuple[int, str]]:
+    messages = []
+    for turn in range(turns):
+        messages.append((ROLE_USER, f"{rng.choice(QUESTIONS)} ({session_idx}-{turn})"))
+        messages.append((ROLE_ASSISTANT, RECIPE_TEMPLATE.format(
+            name=f"김치찌개 #{session_idx}-{turn}", tip=rng.choice(TIPS),
+        )))
+    return messages
+
+
+def legacy_session(messages: List[Tuple[int, str]]):
+    # 기존 구조: 세션 dict + ChatMessageHistory + last_recipe / final_recipes 사본
+    history = ChatMessageHistory()
+    for role, text in messages:
+        if role == ROLE_USER:
+            history.add_user_message(text)
+        else:
+            history.add_ai_message(text)
+    last = messages[-1][1]
+    session = {
+        "allergy": ["땅콩"],
+        "preferences": "매운 음식 선호",
+        "cooking_level": "beginner",
+        "food_type": "김치찌개",
+        "is_finalized": True,
+        "last_recipe": {"content": str(last), "name": "김치찌개"},
+    }
+    final = {"recipe_name": "김치찌개", "recipe_content": str(last), "image_prompt": "A beautifully plated 김치찌개"}
+    return session, history, final
+
+
+def compact_session(messages: List[Tuple[int, str]]):
+    record = SessionRecord(
+        allergy=["땅콩"],
+        preferences="매운 음식 선호",
+        cooking_level="beginner",
+        food_type="김치찌개",
+        is_finalized=True,
+    )
+    for role, text in messages:
+        record.messages.append(role, text)
+    record.recipe_messages.append(len(record.messages) - 1)
+    record.recipe_name = "김치찌개"
+    record.final = {"recipe_name": "김치찌개", "recipe_index": len(record.messages) - 1,
+                    "image_prompt": "A beautifully plated 김치찌개"}
+    return record
+
+
+def measure(factory: Callable, sessions: int, turns: int, seed: int) -> Tuple[float, int]:
+    rng = random.Random(seed)
+    conversations = [build_conversation(rng, i, turns) for i in range(sessions)]
+    raw_bytes = sum(len(text.encode("utf-8")) for conv in conversations for _, text in conv)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    # 원문 문자열은 측정 밖에서 만들어 두고, 각 표현이 추가로 잡는 메모리만 측정
+    store = {i: factory([(role, text[:-1] + text[-1]) for role, text in conv]) for i, conv in enumerate(conversations)}
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return (after - before) / sessions, raw_bytes // sessions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    legacy, raw = measure(legacy_session, args.sessions, args.turns, args.seed)
+    compact, _ = measure(compact_session, args.sessions, args.turns, args.seed)
+    print(f"sessions={args.sessions} turns={args.turns} raw utf-8 text={raw:,} B/session")
+    print(f"legacy  (dict + ChatMessageHistory): {legacy:,.0f} B/session")
+    print(f"compact (SessionRecord + zstd)     : {compact:,.0f} B/session ({compact / legacy:.0%} of legacy)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+WebSocket 부하 테스트 - 턴마다 POST/SSE 요청 vs 세션당 WebSocket 연결 1개
+- 로컬 uvicorn 서버 + bench_batch의 stand-in 서비스 (가짜 임베딩 / LLM 지연)
+- POST/SSE: 턴마다 새 연결 + CORS preflight (브라우저 cross-origin fetch와 동일)
+- WebSocket: 세션당 핸드셰이크 1회 후 같은 연결로 모든 턴 전송
+- 첫 토큰까지 시간(TTFT)과 턴 전체 시간의 p50 / p95 / p99 비교
+
+실행 (backend/ai_cookbook 에서, .env 필요):
+    python -m benchmarks.bench_ws --clients 16 --turns 8 --llm-ms 200
+"""
+
+import argparse
+import json
+import logging
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+import websocket
+
+import main as app_module
+from benchmarks.bench_batch import make_service
+from config.settings import settings
+
+ORIGIN = settings.cors_origins[0]
+QUESTIONS = ["좀 더 맵게 해줘", "양파는 빼고 만들어줘", "2인분으로 바꿔줘", "더 간단하게 알려줘"]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(app_module.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def sse_client(base: str, session_id: str, turns: int) -> Dict[str, List[float]]:
+    result = {"connect": [], "ttft": [], "total": []}
+    url = f"{base}/recipeChat/chat/{session_id}/stream"
+    for turn in range(turns):
+        start = time.perf_counter()
+        # 턴마다 새 연결 (fetch 스트리밍 응답은 연결을 재사용하지 못하는 경우가 많음)
+        with httpx.Client(timeout=60) as client:
+            client.options(url, headers={
+                "Origin": ORIGIN,
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type",
+            })
+            result["connect"].append(time.perf_counter() - start)
+            first = None
+            with client.stream("POST", url, json={"message": QUESTIONS[turn % len(QUESTIONS)]},
+                               headers={"Origin": ORIGIN}) as response:
+                for line in response.iter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    event = json.loads(line[6:])
+                    if first is None and "chunk" in event:
+                        first = time.perf_counter() - start
+                    if event.get("done") or "error" in event:
+                        break
+        result["ttft"].append(first or 0.0)
+        result["total"].append(time.perf_counter() - start)
+    return result
+
+
+def ws_client(base: str, session_id: str, turns: int) -> Dict[str, List[float]]:
+    result = {"connect": [], "ttft": [], "total": []}
+    start = time.perf_counter()
+    conn = websocket.create_connection(
+        f"{base.replace('http', 'ws', 1)}/recipeChat/ws/{session_id}", origin=ORIGIN, timeout=60,
+    )
+    result["connect"].append(time.perf_counter() - start)
+    try:
+        for turn in range(turns):
+            turn_id = f"t{turn}"
+            start = time.perf_counter()
+            conn.send(json.dumps({"type": "chat", "id": turn_id, "message": QUESTIONS[turn % len(QUESTIONS)]}))
+            first = None
+            while True:
+                event = json.loads(conn.recv())
+                if event.get("id") != turn_id:
+                    continue
+                if first is None and event["type"] == "chunk":
+                    first = time.perf_counter() - start
+                if event["type"] in ("done", "error", "cancelled"):
+                    break
+            result["ttft"].append(first or 0.0)
+            result["total"].append(time.perf_counter() - start)
+    finally:
+        conn.close()
+    return result
+
+
+def run(client_fn, base: str, session_ids: List[str], turns: int) -> Dict[str, List[float]]:
+    merged = {"connect": [], "ttft": [], "total": []}
+    with ThreadPoolExecutor(max_workers=len(session_ids)) as pool:
+        for result in pool.map(lambda sid: client_fn(base, sid, turns), session_ids):
+            for key, values in result.items():
+                merged[key].extend(values)
+    return merged
+
+
+def percentiles(values: List[float]) -> str:
+    if len(values) < 2:
+        return f"mean {statistics.fmean(values) * 1000:7.1f}ms"
+    cuts = statistics.quantiles(values, n=100)
+    return (f"p50 {cuts[49] * 1000:7.1f}ms  p95 {cuts[94] * 1000:7.1f}ms  "
+            f"p99 {cuts[98] * 1000:7.1f}ms  mean {statistics.fmean(values) * 1000:7.1f}ms")
+
+
+def report(name: str, result: Dict[str, List[float]]):
+    print(f"[{name}]")
+    print(f"  connect x{len(result['connect']):<4} {percentiles(result['connect'])}")
+    print(f"  ttft    x{len(result['ttft']):<4} {percentiles(result['ttft'])}")
+    print(f"  total   x{len(result['total']):<4} {percentiles(result['total'])}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--embed-ms", type=float, default=20)
+    parser.add_argument("--llm-ms", type=float, default=200)
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    service = make_service(args.embed_ms, args.llm_ms)
+    app_module.chat_service = service
+    port = free_port()
+    server = start_server(port)
+    base = f"http://127.0.0.1:{port}"
+
+    def new_sessions() -> List[str]:
+        return [service.init_session("", "", "beginner", "김치찌개")["session_id"] for _ in range(args.clients)]
+
+    try:
+        print(f"clients={args.clients} turns={args.turns} embed={args.embed_ms}ms llm={args.llm_ms}ms")
+        report("POST/SSE (connection + preflight per turn)", run(sse_client, base, new_sessions(), args.turns))
+        report("WebSocket (one connection per session)", run(ws_client, base, new_sessions(), args.turns))
+    finally:
+        server.should_exit = True
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
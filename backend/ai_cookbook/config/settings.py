@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 load_dotenv()
 
@@ -26,6 +26,80 @@ class Settings(BaseSettings):
     rag_host: str = "localhost"
     rag_port: int = 6333
     rag_collection_name: str
+    rag_grpc_port: int = 6334
+    rag_prefer_grpc: bool = False  # True면 rag_grpc_port로 접속 (포트가 열려 있어야 함)
+
+    # Qdrant 검색 튜닝
+    rag_top_k: int = 10
+    rag_payload_fields: List[str] = ["page_content"]  # 비우면 전체 payload
+    rag_hnsw_ef: Optional[int] = None
+    rag_score_threshold: Optional[float] = None
+    rag_quantization_rescore: bool = False
+    rag_quantization_oversampling: Optional[float] = None
+
+    # 하이브리드 검색 (BM25 + dense, RRF 결합)
+    rag_hybrid_enabled: bool = False
+    rag_hybrid_candidates: int = 20  # dense / sparse 각각 가져올 후보 수
+    rag_rrf_k: int = 60
+
+    # 알러지 식재료가 포함된 청크를 검색 단계에서 제외
+    rag_allergen_filter_enabled: bool = True
+
+    # 프롬프트 배치: "prefix_cache" (고정 prefix + 검색 컨텍스트는 마지막) | "legacy"
+    rag_prompt_layout: str = "prefix_cache"
+
+    # 공유 HTTP 클라이언트 설정 (LLM / 임베딩 / 번역)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http2_enabled: bool = True
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 60.0
+    http_max_retries: int = 3
+    http_backoff_base: float = 0.5
+    http_backoff_max: float = 8.0
+
+    # 의미 기반 응답 캐시
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.95  # 코사인 유사도
+    semantic_cache_ttl_seconds: int = 3600
+    semantic_cache_max_entries: int = 5000
+
+    # 투기적 사전 확정 (레시피 응답 즉시 최종 레시피 / 이미지 준비)
+    speculative_finalize_enabled: bool = True
+    speculative_image_enabled: bool = False  # selenium 필요
+    speculative_workers: int = 2
+
+    # 배치 레시피 생성 (식단 계획)
+    batch_max_items: int = 14
+    batch_concurrency: int = 4
+
+    # LLM 호출 스케줄러 (입장 제어)
+    llm_max_concurrency: int = 8  # 동시에 진행할 LLM 호출 수
+    llm_tokens_per_minute: int = 0  # 분당 토큰 예산 (0이면 미적용)
+    llm_tokens_per_call: int = 2000  # 호출 1회 예상 토큰 (프롬프트 + 컨텍스트 + 응답)
+    llm_chat_queue_slo: float = 5.0  # 우선순위별 최대 대기 시간 (초), 넘을 것 같으면 503
+    llm_init_queue_slo: float = 15.0
+    llm_background_queue_slo: float = 30.0
+
+    # 히스토리 API
+    history_page_max: int = 200  # 페이지당 최대 메시지 수
+    history_cache_max_blocks: int = 1024  # 직렬화 캐시에 둘 압축 블록 수 (블록당 메시지 4개)
+
+    # 모델 라우팅 (빠른 모델은 LLM_FAST_MODEL 환경 변수로 지정)
+    llm_fast_max_chars: int = 40  # 이보다 긴 메시지는 항상 메인 모델
+    llm_main_cost_per_1k: float = 0.0  # 1K 토큰당 비용 (통계용)
+    llm_fast_cost_per_1k: float = 0.0
+
+    # 최종 레시피 정적 페이지 (확정 시 렌더링, 내용 해시 URL)
+    recipe_pages_enabled: bool = True
+    recipe_pages_dir: str = "static/recipes"  # 앱 디렉터리 기준 (gitignore), 리버스 프록시에서 직접 서빙해도 됨
+    recipe_pages_max_age: int = 31536000  # 내용이 바뀌면 URL이 바뀌므로 1년 캐시
+
+    # WebSocket 채팅
+    ws_send_buffer: int = 64  # 연결별 송신 버퍼 (메시지 수)
+    ws_event_buffer: int = 16  # 연결별 세션 이벤트 버퍼
+    ws_turn_buffer: int = 8  # 연결별 대기 턴 수 (넘으면 error 응답)
 
     # CORS 설정
     cors_origins: List[str] = ["http://localhost:5173"]
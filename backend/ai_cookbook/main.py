@@ -1,9 +1,11 @@
 # FastAPI 관련 모듈 import
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import logging
 import json
 
@@ -14,18 +16,35 @@ from config.settings import settings
 from models.recipe import (
     InitSessionRequest,
     InitSessionResponse,
+    BatchInitRequest,
+    BatchItemResponse,
     ChatRequest,
     ChatResponse,
     FinalRecipeRequest,
     FinalRecipeResponse,
     ChatHistoryResponse,
+    SessionInfoResponse,
 )
+from services.chat_connection import ChatConnection
 from services.chat_service import ChatService
+from services.http_client import aclose_http_clients
+from services.llm_scheduler import LLMOverloaded
+from services.recipe_pages import get_recipe_page_store
 
 load_dotenv()
 
 chat_service: ChatService = None
 
+
+def _qdrant_address() -> str:
+    # gRPC를 켜면 REST 포트(rag_port)가 아니라 rag_grpc_port로 접속
+    if settings.rag_prefer_grpc:
+        return f"{settings.rag_host}:{settings.rag_grpc_port} (gRPC, RAG_GRPC_PORT)"
+    return f"{settings.rag_host}:{settings.rag_port} (REST, RAG_PORT)"
+
+
+SERVICE_UNAVAILABLE = f"ChatService is not available. Please ensure Qdrant is running at {_qdrant_address()}"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 리소스 관리"""
@@ -36,13 +55,16 @@ async def lifespan(app: FastAPI):
         logger.info("ChatService initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize ChatService: {e}")
-        logger.warning("Server will start without ChatService. Please ensure Qdrant is running at localhost:6333")
+        logger.warning(f"Server will start without ChatService. Please ensure Qdrant is running at {_qdrant_address()}")
         chat_service = None
 
     try:
         yield
     finally:
         logger.info("Shutting down...")
+        if chat_service is not None:
+            chat_service.close()
+        await aclose_http_clients()
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -66,6 +88,16 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(LLMOverloaded)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloaded):
+    """LLM 대기열이 SLO를 넘을 때 - 대기시키지 않고 바로 503"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 
 # ========== API 엔드 포인트 (윤환 2025.11.29) START ==========
 # ============ 1페이지: 세션 초기화 (사용자 정보 + 음식 종류) ============
@@ -79,10 +111,12 @@ async def init_session(request: InitSessionRequest):
     if chat_service is None:
         raise HTTPException(
             status_code=503,
-            detail="ChatService is not available. Please ensure Qdrant is running at localhost:6333"
+            detail=SERVICE_UNAVAILABLE
         )
 
-    result = chat_service.init_session(
+    # LLM 호출이 동기 방식이므로 스레드풀에서 실행 (이벤트 루프 차단 방지)
+    result = await run_in_threadpool(
+        chat_service.init_session,
         allergy=request.allergy,
         preferences=request.preferences,
         cooking_level=request.cooking_level,
@@ -95,6 +129,36 @@ async def init_session(request: InitSessionRequest):
     )
 
 
+@app.post("/recipeChat/batch")
+async def init_sessions_batch(request: BatchInitRequest):
+    """
+    1페이지에서 호출 (식단 계획)
+    - 공통 프로필로 여러 음식 종류의 세션을 한 번에 생성
+    - 완료되는 순서대로 항목별 결과를 NDJSON으로 스트리밍
+    """
+    if chat_service is None:
+        raise HTTPException(
+            status_code=503,
+            detail=SERVICE_UNAVAILABLE
+        )
+    if len(request.food_types) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=422,
+            detail=f"한 번에 최대 {settings.batch_max_items}개까지 요청할 수 있습니다.",
+        )
+
+    async def generate():
+        async for item in chat_service.init_sessions_batch(
+            allergy=request.allergy,
+            preferences=request.preferences,
+            cooking_level=request.cooking_level,
+            food_types=request.food_types,
+        ):
+            yield BatchItemResponse(**item).model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 # ============ 2페이지: 채팅 ============
 
 @app.post("/recipeChat/chat/{session_id}", response_model=ChatResponse)
@@ -103,13 +167,14 @@ async def chat(session_id: str, request: ChatRequest):
     2페이지에서 호출
     - 사용자와 대화하며 레시피 수정/추천
     """
-    result = chat_service.chat(session_id=session_id, message=request.message)
+    result = await run_in_threadpool(chat_service.chat, session_id=session_id, message=request.message)
     if result is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
     return ChatResponse(
         session_id=session_id,
         response=result["response"],
         is_recipe=result["is_recipe"],
+        allergen_warnings=result["allergen_warnings"],
     )
 
 
@@ -122,36 +187,110 @@ async def chat_stream(session_id: str, request: ChatRequest):
     if chat_service is None:
         raise HTTPException(
             status_code=503,
-            detail="ChatService is not available. Please ensure Qdrant is running at localhost:6333"
+            detail=SERVICE_UNAVAILABLE
         )
 
+    if session_id not in chat_service.sessions:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+
+    # 첫 청크까지 받은 뒤 응답 시작 (대기열 차단 시 SSE 대신 503 + Retry-After)
+    stream = chat_service.chat_stream(session_id=session_id, message=request.message)
+    first_chunk, first_error = None, None
+    try:
+        first_chunk = await anext(stream, None)
+    except LLMOverloaded:
+        raise
+    except Exception as e:
+        first_error = e
+
     async def generate():
         try:
-            async for chunk in chat_service.chat_stream(session_id=session_id, message=request.message):
+            if first_error is not None:
+                raise first_error
+            if first_chunk is not None:
+                yield f"data: {json.dumps({'chunk': first_chunk}, ensure_ascii=False)}\n\n"
+            async for chunk in stream:
                 # Server-Sent Events (SSE) 형식으로 전송
                 yield f"data: {json.dumps({'chunk': chunk}, ensure_ascii=False)}\n\n"
-            # 스트리밍 종료 신호
-            yield f"data: {json.dumps({'done': True}, ensure_ascii=False)}\n\n"
+            # 스트리밍 종료 신호 (알러지 검사 결과 포함)
+            warnings = chat_service.sessions[session_id].allergen_warnings
+            yield f"data: {json.dumps({'done': True, 'allergen_warnings': warnings}, ensure_ascii=False)}\n\n"
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             yield f"data: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
 
-    if session_id not in chat_service.sessions:
-        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 
+@app.websocket("/recipeChat/ws/{session_id}")
+async def chat_websocket(websocket: WebSocket, session_id: str):
+    """
+    2페이지에서 사용 (WebSocket 버전)
+    - 세션당 연결 1개로 여러 턴을 처리 (토큰 스트리밍, 취소, 확정/이미지 이벤트)
+    """
+    if chat_service is None or session_id not in chat_service.sessions:
+        await websocket.close(code=4404, reason="세션을 찾을 수 없습니다.")
+        return
+
+    await websocket.accept()
+    connection = ChatConnection(
+        websocket,
+        chat_service,
+        session_id,
+        send_buffer=settings.ws_send_buffer,
+        turn_buffer=settings.ws_turn_buffer,
+    )
+    await connection.run()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
 @app.get("/recipeChat/chat/{session_id}/history", response_model=ChatHistoryResponse)
-async def get_chat_history(session_id: str):
-    """채팅 히스토리 조회 (페이지 새로고침 시 복원용)"""
-    history = chat_service.get_chat_history(session_id)
-    if history is None:
+async def get_chat_history(
+    session_id: str,
+    since: int = Query(default=0, ge=0, description="이 위치(메시지 인덱스)부터 조회"),
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.history_page_max),
+    include_info: bool = Query(default=False, description="세션 정보를 함께 반환"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    채팅 히스토리 조회 (페이지 새로고침 시 복원용)
+    - since / next_cursor로 새 메시지만 이어서 조회
+    - ETag가 같으면 304 (히스토리와 확정 상태가 바뀌지 않음)
+    """
+    page = chat_service.get_history_page(session_id, since=since, limit=limit)
+    if page is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-    return ChatHistoryResponse(session_id=session_id, history=history)
 
+    # 같은 버전이라도 조회 범위 / 옵션이 다르면 다른 응답
+    etag = f'"{page["version"]}-{since}-{limit or 0}-{int(include_info)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # 항목은 이미 직렬화된 JSON이므로 모델 검증 없이 그대로 이어 붙임
+    meta = {
+        "session_id": session_id,
+        "total": page["total"],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+        "info": chat_service.get_session_info(session_id) if include_info else None,
+    }
+    body = b"".join([
+        json.dumps(meta, ensure_ascii=False).encode("utf-8")[:-1],
+        b', "history": [',
+        b", ".join(page["items"]),
+        b"]}",
+    ])
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@app.get("/recipeChat/session/{session_id}/info")
+
+@app.get("/recipeChat/session/{session_id}/info", response_model=SessionInfoResponse)
 async def get_session_info(session_id: str):
     """세션 정보 조회 (사용자 프로필 + 음식 종류)"""
     info = chat_service.get_session_info(session_id)
@@ -168,7 +307,9 @@ async def finalize_recipe(session_id: str, request: FinalRecipeRequest):
     2페이지에서 '레시피 확정' 버튼 클릭 시 호출
     - 현재까지의 대화에서 최종 레시피 확정
     """
-    result = chat_service.finalize_recipe(
+    # 정적 페이지 렌더링 / 압축 / 파일 쓰기가 포함되므로 스레드풀에서 실행
+    result = await run_in_threadpool(
+        chat_service.finalize_recipe,
         session_id=session_id,
         user_confirmation=request.user_confirmation,
     )
@@ -179,6 +320,9 @@ async def finalize_recipe(session_id: str, request: FinalRecipeRequest):
         recipe_name=result["recipe_name"],
         recipe_content=result["recipe_content"],
         image_prompt=result["image_prompt"],
+        image_url=result.get("image_url"),
+        page_url=result.get("page_url"),
+        json_url=result.get("json_url"),
         is_finalized=True,
     )
 
@@ -200,10 +344,34 @@ async def get_final_recipe(session_id: str):
         recipe_name=result["recipe_name"],
         recipe_content=result["recipe_content"],
         image_prompt=result["image_prompt"],
+        image_url=result.get("image_url"),
+        page_url=result.get("page_url"),
+        json_url=result.get("json_url"),
         is_finalized=True,
     )
 
 
+@app.get("/recipeChat/pages/{name}")
+async def get_recipe_page(name: str, accept_encoding: Optional[str] = Header(default=None)):
+    """
+    공유용 정적 레시피 페이지 (확정 시 미리 렌더링 / 압축된 파일)
+    - 세션을 거치지 않고 디스크에서 바로 전송 (uvicorn은 청크 단위로 읽어서 전송,
+      zero-copy가 필요하면 리버스 프록시에서 recipe_pages_dir를 직접 서빙)
+    - 이름이 내용 해시이므로 immutable 캐시
+    """
+    resolved = get_recipe_page_store().resolve(name, accept_encoding)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="페이지를 찾을 수 없습니다.")
+    path, encoding, media_type = resolved
+    headers = {
+        "Cache-Control": f"public, max-age={settings.recipe_pages_max_age}, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
 # ============ 공통 ============
 
 @app.delete("/recipeChat/session/{session_id}")
@@ -215,6 +383,17 @@ async def delete_session(session_id: str):
     return {"message": "세션이 삭제되었습니다."}
 
 
+@app.get("/recipeChat/metrics")
+async def get_metrics():
+    """운영 지표 조회 (HTTP 커넥션 재사용 등)"""
+    if chat_service is None:
+        raise HTTPException(
+            status_code=503,
+            detail=SERVICE_UNAVAILABLE
+        )
+    return chat_service.get_metrics()
+
+
 @app.get("/recipeChat/health")
 async def health_check():
     return {"status": "healthy"}
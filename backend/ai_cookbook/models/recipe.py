@@ -38,6 +38,32 @@ class InitSessionResponse(BaseModel):
     message: str
 
 
+class BatchInitRequest(BaseModel):
+    """1페이지 - 배치 세션 초기화 요청 (식단 계획, 공통 프로필)"""
+    allergy: str = Field(default="", description="알러지 목록", example="땅콩, 갑각류")
+    preferences: str = Field(default="", description="사용자 취향/선호사항")
+    cooking_level: Literal["beginner", "intermediate", "advanced"] = Field(
+        default="beginner",
+        description="요리 숙련도",
+    )
+    food_types: List[str] = Field(
+        ...,
+        min_length=1,
+        description="만들고자 하는 음식 종류 목록",
+        example=["김치찌개", "된장찌개", "제육볶음"],
+    )
+
+
+class BatchItemResponse(BaseModel):
+    """배치 세션 초기화 - 항목별 결과 (NDJSON 한 줄)"""
+    index: int
+    food_type: str
+    session_id: Optional[str] = Field(default=None, description="생성된 세션 ID (검색 단계 실패 시 없음)")
+    initial_message: Optional[str] = None
+    is_recipe: bool = False
+    error: Optional[str] = None
+
+
 # ============ 2페이지: 채팅 ============
 
 class ChatRequest(BaseModel):
@@ -49,11 +75,22 @@ class ChatRequest(BaseModel):
     )
 
 
+class AllergenWarning(BaseModel):
+    """응답에서 발견된 알러지 식재료"""
+    allergy: str = Field(description="사용자가 입력한 알러지")
+    term: str = Field(description="응답에서 발견된 식재료")
+    line: str = Field(description="발견된 줄")
+
+
 class ChatResponse(BaseModel):
     """채팅 응답"""
     session_id: str
     response: str = Field(description="챗봇 응답")
     is_recipe: bool = Field(default=False, description="레시피 응답 여부")
+    allergen_warnings: List[AllergenWarning] = Field(
+        default_factory=list,
+        description="응답에 포함된 알러지 식재료 경고",
+    )
 
 
 class ChatHistoryItem(BaseModel):
@@ -62,10 +99,23 @@ class ChatHistoryItem(BaseModel):
     content: str
 
 
+class SessionInfoResponse(BaseModel):
+    """세션 정보 응답"""
+    allergy: List[str]
+    preferences: str
+    cooking_level: str
+    food_type: str
+    is_finalized: bool
+
+
 class ChatHistoryResponse(BaseModel):
-    """채팅 히스토리 응답"""
+    """채팅 히스토리 응답 (since 위치부터의 페이지)"""
     session_id: str
     history: List[ChatHistoryItem]
+    total: int = Field(default=0, description="전체 메시지 수")
+    next_cursor: int = Field(default=0, description="다음 요청의 since 값")
+    has_more: bool = Field(default=False, description="뒤에 메시지가 더 있는지 여부")
+    info: Optional[SessionInfoResponse] = Field(default=None, description="세션 정보 (include_info=true일 때)")
 
 
 # ============ 2→3페이지: 레시피 확정 ============
@@ -84,4 +134,7 @@ class FinalRecipeResponse(BaseModel):
     recipe_name: str = Field(description="레시피 이름")
     recipe_content: str = Field(description="레시피 전체 내용")
     image_prompt: str = Field(description="이미지 생성용 프롬프트")
+    image_url: Optional[str] = Field(default=None, description="미리 생성된 이미지 URL")
+    page_url: Optional[str] = Field(default=None, description="공유용 정적 페이지 URL (내용 해시)")
+    json_url: Optional[str] = Field(default=None, description="정적 JSON URL (내용 해시)")
     is_finalized: bool = Field(default=False, description="확정 여부")
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Aho-Corasick 다중 문자열 매칭
+- 패턴 개수와 무관하게 텍스트를 한 번만 스캔
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """다중 문자열 매칭 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append(pattern)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def step(self, state: int, char: str) -> int:
+        """한 글자 전이 - 스트리밍 입력에서 상태를 이어가기 위해 사용"""
+        while state and char not in self.goto[state]:
+            state = self.fail[state]
+        return self.goto[state].get(char, 0)
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str]]:
+        """(끝 위치, 패턴) 순회"""
+        state = 0
+        for pos, char in enumerate(text):
+            state = self.step(state, char)
+            for pattern in self.output[state]:
+                yield pos, pattern
+
+    def find(self, text: str) -> Set[str]:
+        return {pattern for _, pattern in self.iter_matches(text)}
@@ -0,0 +1,216 @@
+"""
+알러지 서비스 - 동의어 사전 기반 알러지 식재료 탐지
+- Aho-Corasick 다중 패턴 매칭 (사전 전체를 한 번의 스캔으로)
+- 검색 전 필터링용 청크 인덱스 (식재료별 비트맵)
+- 생성 후 응답 검사
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.aho_corasick import AhoCorasick
+
+# 대표 알러지 → 동의어 / 포함 식재료
+# 한 글자 단어("잣", "햄", 사용자가 입력한 "굴" 등)는 일반 단어와 겹치므로 단어 경계에서만 매칭
+ALLERGEN_SYNONYMS: Dict[str, List[str]] = {
+    "땅콩": ["땅콩", "피넛", "땅콩버터"],
+    "견과류": ["견과", "호두", "아몬드", "잣", "캐슈넛", "피스타치오", "마카다미아", "헤이즐넛", "피칸"],
+    "갑각류": ["갑각류", "새우", "꽃게", "대게", "킹크랩", "게살", "게장", "랍스터", "가재", "크랩"],
+    "조개류": ["조개", "바지락", "홍합", "굴소스", "전복", "가리비", "모시조개", "꼬막", "관자"],
+    "생선": ["생선", "고등어", "연어", "참치", "멸치", "갈치", "명태", "동태", "황태", "코다리", "삼치", "꽁치", "액젓"],
+    "오징어": ["오징어", "한치", "주꾸미", "낙지", "문어"],
+    "우유": ["우유", "유제품", "치즈", "버터", "생크림", "요거트", "요구르트", "연유", "크림치즈", "휘핑크림"],
+    "계란": ["계란", "달걀", "메추리알", "마요네즈", "노른자", "흰자"],
+    "밀": ["밀가루", "부침가루", "튀김가루", "빵가루", "중력분", "박력분", "강력분", "파스타", "스파게티", "우동", "라면", "국수"],
+    "대두": ["대두", "두부", "된장", "간장", "청국장", "두유", "콩기름"],
+    "메밀": ["메밀"],
+    "참깨": ["참깨", "깨소금", "참기름"],
+    "복숭아": ["복숭아"],
+    "토마토": ["토마토", "케첩"],
+    "돼지고기": ["돼지고기", "삼겹살", "목살", "베이컨", "햄", "소시지"],
+    "소고기": ["소고기", "쇠고기", "차돌박이", "양지", "사태"],
+    "닭고기": ["닭고기", "닭가슴살", "닭다리", "닭봉"],
+}
+
+# 사용자가 짧게 입력하는 알러지 → 대표 알러지
+ALLERGEN_ALIASES: Dict[str, str] = {
+    "게": "갑각류",
+    "굴": "조개류",
+    "콩": "대두",
+    "깨": "참깨",
+    "달걀": "계란",
+    "유제품": "우유",
+    "밀가루": "밀",
+    "견과": "견과류",
+}
+
+# 식재료 바로 뒤에 붙은 제외 표현 ("땅콩은 빼고", "우유 없이", "새우 알러지") → 해당 언급만 무시
+NEGATION_PATTERN = re.compile(r"[^\s,.()]*?\s*(?:빼|없이|제외|넣지|대신|알러지|알레르기)")
+
+# 한 글자 단어 뒤에 올 수 있는 조사
+PARTICLES = "은는이가을를도와과의에로만"
+
+# 항목 구분은 쉼표 / 슬래시 / 가운뎃점 / 줄바꿈만 ("땅콩 버터"는 한 항목)
+SPLIT_PATTERN = re.compile(r"[,/·\n]+")
+# "갑각류 알레르기" → "갑각류"
+ALLERGY_SUFFIX_PATTERN = re.compile(r"\s*(?:알레르기|알러지)$")
+
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+
+def _at_boundary(text: str, start: int, term: str) -> bool:
+    """한 글자 단어는 앞이 한글이 아니고, 뒤가 한글이 아니거나 조사일 때만 인정"""
+    if len(term) > 1:
+        return True
+    before = text[start - 1] if start > 0 else ""
+    after = text[start + 1] if start + 1 < len(text) else ""
+    return not _is_hangul(before) and (not _is_hangul(after) or after in PARTICLES)
+
+
+def iter_terms(automaton: AhoCorasick, text: str) -> Iterable[Tuple[int, str]]:
+    """(시작 위치, 단어) 순회 - 한 글자 단어는 단어 경계 매칭만"""
+    for end, term in automaton.iter_matches(text):
+        start = end - len(term) + 1
+        if _at_boundary(text, start, term):
+            yield start, term
+
+
+def contains_term(text: str, term: str) -> bool:
+    start = text.find(term)
+    while start != -1:
+        if _at_boundary(text, start, term):
+            return True
+        start = text.find(term, start + 1)
+    return False
+
+
+def parse_allergies(allergy: Any) -> List[str]:
+    """'땅콩, 갑각류' 형태 문자열 또는 리스트 → 알러지 목록"""
+    if not allergy:
+        return []
+    items = allergy if isinstance(allergy, list) else SPLIT_PATTERN.split(allergy)
+    parsed = [ALLERGY_SUFFIX_PATTERN.sub("", item.strip()).strip() for item in items]
+    return [item for item in parsed if item and item != "없음"]
+
+
+def expand_allergies(allergies: Iterable[str]) -> Dict[str, str]:
+    """사용자 알러지 → {검색어: 대표 알러지} (동의어 확장)"""
+    terms: Dict[str, str] = {}
+    for allergy in allergies:
+        canonical = ALLERGEN_ALIASES.get(allergy, allergy)
+        # 사용자 입력 자체는 항상 포함 (한 글자 단어는 매칭 시 단어 경계 확인)
+        terms[allergy] = allergy
+        for group, synonyms in ALLERGEN_SYNONYMS.items():
+            if canonical == group or canonical in synonyms:
+                for synonym in synonyms:
+                    terms.setdefault(synonym, allergy)
+    return terms
+
+
+class AllergenScanner:
+    """사용자 알러지 기준 텍스트 검사기"""
+
+    def __init__(self, allergies: Iterable[str]):
+        self.terms = expand_allergies(allergies)
+        self.automaton = AhoCorasick(self.terms)
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def scan(self, text: str) -> List[Dict[str, str]]:
+        """응답에서 알러지 식재료 언급 탐지 (바로 뒤에 제외 표현이 붙은 언급은 무시)"""
+        found: Dict[str, Dict[str, str]] = {}
+        for line in text.splitlines():
+            for start, term in iter_terms(self.automaton, line):
+                if NEGATION_PATTERN.match(line, start + len(term)):
+                    continue
+                found.setdefault(term, {"allergy": self.terms[term], "term": term, "line": line.strip()})
+        return list(found.values())
+
+
+class AllergenIndex:
+    """청크별 알러지 식재료 비트맵 인덱스 (Qdrant payload에서 구축)"""
+
+    def __init__(self):
+        self.point_ids: List[Any] = []
+        self.texts: List[str] = []
+        self.bitmaps: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_documents(self, points: Iterable[Tuple[Any, str]]):
+        automaton = AhoCorasick({s for synonyms in ALLERGEN_SYNONYMS.values() for s in synonyms})
+        for point_id, text in points:
+            bit = 1 << len(self.point_ids)
+            self.point_ids.append(point_id)
+            self.texts.append(text)
+            for _, term in iter_terms(automaton, text):
+                self.bitmaps[term] = self.bitmaps.get(term, 0) | bit
+
+    def _bitmap(self, term: str) -> int:
+        # 사전에 없는 알러지는 최초 요청 시 한 번만 스캔
+        if term not in self.bitmaps:
+            with self._lock:
+                if term not in self.bitmaps:
+                    bitmap = 0
+                    for idx, text in enumerate(self.texts):
+                        if contains_term(text, term):
+                            bitmap |= 1 << idx
+                    self.bitmaps[term] = bitmap
+        return self.bitmaps[term]
+
+    def excluded_ids(self, allergies: Iterable[str]) -> Set[Any]:
+        mask = 0
+        for term in expand_allergies(allergies):
+            mask |= self._bitmap(term)
+        ids: Set[Any] = set()
+        while mask:
+            lowest = mask & -mask
+            ids.add(self.point_ids[lowest.bit_length() - 1])
+            mask ^= lowest
+        return ids
+
+    @classmethod
+    def from_qdrant(
+        cls,
+        client: Any,
+        collection_name: str,
+        content_key: str = "page_content",
+        batch_size: int = 256,
+    ) -> "AllergenIndex":
+        index = cls()
+        offset: Optional[Any] = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=[content_key],
+                with_vectors=False,
+            )
+            index.add_documents((r.id, (r.payload or {}).get(content_key, "")) for r in records)
+            if offset is None:
+                break
+        return index
+
+
+class LazyAllergenIndex:
+    """첫 필터링 요청 시점에 Qdrant에서 인덱스를 구축"""
+
+    def __init__(self, client: Any, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        self._index: Optional[AllergenIndex] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> AllergenIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = AllergenIndex.from_qdrant(self.client, self.collection_name)
+        return self._index
+
+    def excluded_ids(self, allergies: Iterable[str]) -> Set[Any]:
+        return self.get().excluded_ids(allergies)
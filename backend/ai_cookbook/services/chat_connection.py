@@ -0,0 +1,163 @@
+"""
+WebSocket 채팅 연결 - 세션당 하나의 연결로 여러 턴을 처리
+- 턴은 순서대로 실행 (히스토리 일관성), 토큰 스트리밍
+- 클라이언트 취소 (진행 중 / 대기 중 턴)
+- 연결별 송신 버퍼 (가득 차면 LLM 스트림 소비를 멈춰 backpressure)
+- 대기 턴 수 제한 (가득 차면 error 응답)
+- 확정 / 이미지 작업 이벤트 푸시
+
+프로토콜 (JSON):
+    client → {"type": "chat", "id": "t1", "message": "..."}
+             {"type": "cancel", "id": "t1"}
+             {"type": "finalize", "id": "f1"}
+             {"type": "ping"}
+    server → {"type": "accepted" | "chunk" | "done" | "cancelled" | "error", "id": ...}
+             {"type": "finalized" | "image", ...}  (세션 이벤트)
+             {"type": "pong"}
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from services.llm_scheduler import LLMOverloaded
+
+logger = logging.getLogger(__name__)
+
+
+class ChatConnection:
+    """WebSocket 연결 1개"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        chat_service: Any,
+        session_id: str,
+        send_buffer: int = 64,
+        turn_buffer: int = 8,
+    ):
+        self.websocket = websocket
+        self.chat_service = chat_service
+        self.session_id = session_id
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=send_buffer)
+        self.turns: asyncio.Queue = asyncio.Queue(maxsize=turn_buffer)
+        self.current: Optional[Tuple[str, asyncio.Task]] = None
+        self.cancelled: Set[str] = set()
+
+    async def run(self):
+        events = self.chat_service.subscribe(self.session_id)
+        workers = [
+            asyncio.create_task(self._sender()),
+            asyncio.create_task(self._turn_worker()),
+            asyncio.create_task(self._event_pump(events)),
+        ]
+        try:
+            await self._receiver()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.chat_service.unsubscribe(self.session_id, events)
+            if self.current is not None:
+                self.current[1].cancel()
+            for worker in workers:
+                worker.cancel()
+
+    async def send(self, event: Dict[str, Any]):
+        # 송신 버퍼가 가득 차면 여기서 대기 → 생산자(LLM 스트림)도 함께 멈춤
+        await self.outbox.put(event)
+
+    async def _sender(self):
+        while True:
+            event = await self.outbox.get()
+            await self.websocket.send_json(event)
+
+    async def _event_pump(self, events: asyncio.Queue):
+        while True:
+            await self.send(await events.get())
+
+    async def _receiver(self):
+        while True:
+            try:
+                data = json.loads(await self.websocket.receive_text())
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                # 잘못된 프레임은 해당 메시지만 거절하고 연결은 유지
+                await self.send({"type": "error", "id": None, "detail": "JSON 객체 형식의 메시지가 아닙니다."})
+                continue
+            kind = data.get("type")
+            turn_id = str(data.get("id") or uuid.uuid4())
+
+            if kind == "chat":
+                message = (data.get("message") or "").strip()
+                if not message:
+                    await self.send({"type": "error", "id": turn_id, "detail": "메시지가 비어 있습니다."})
+                    continue
+                try:
+                    self.turns.put_nowait((turn_id, message))
+                except asyncio.QueueFull:
+                    await self.send({"type": "error", "id": turn_id, "detail": "대기 중인 메시지가 너무 많습니다."})
+                    continue
+                await self.send({"type": "accepted", "id": turn_id})
+            elif kind == "cancel":
+                self._cancel(turn_id)
+            elif kind == "finalize":
+                # 결과는 세션 이벤트("finalized")로 모든 연결에 푸시됨
+                # 페이지 렌더링 / 압축 / 파일 쓰기가 포함되므로 스레드에서 실행
+                result = await asyncio.to_thread(
+                    self.chat_service.finalize_recipe, self.session_id, data.get("user_confirmation", "")
+                )
+                if result is None:
+                    await self.send({"type": "error", "id": turn_id, "detail": "확정할 레시피가 없습니다."})
+            elif kind == "ping":
+                await self.send({"type": "pong"})
+            else:
+                await self.send({"type": "error", "id": turn_id, "detail": f"알 수 없는 메시지 타입: {kind}"})
+
+    def _cancel(self, turn_id: str):
+        if self.current is not None and self.current[0] == turn_id:
+            self.current[1].cancel()
+        else:
+            self.cancelled.add(turn_id)
+
+    async def _turn_worker(self):
+        while True:
+            turn_id, message = await self.turns.get()
+            if turn_id in self.cancelled:
+                self.cancelled.discard(turn_id)
+                await self.send({"type": "cancelled", "id": turn_id})
+                continue
+
+            task = asyncio.create_task(self._stream_turn(turn_id, message))
+            self.current = (turn_id, task)
+            await asyncio.wait({task})
+            self.current = None
+
+            if task.cancelled():
+                await self.send({"type": "cancelled", "id": turn_id})
+            elif isinstance(task.exception(), LLMOverloaded):
+                await self.send({
+                    "type": "error",
+                    "id": turn_id,
+                    "detail": str(task.exception()),
+                    "retry_after": task.exception().retry_after,
+                })
+            elif task.exception() is not None:
+                logger.error(f"WebSocket turn error: {task.exception()}")
+                await self.send({"type": "error", "id": turn_id, "detail": str(task.exception())})
+
+    async def _stream_turn(self, turn_id: str, message: str):
+        async for chunk in self.chat_service.chat_stream(self.session_id, message):
+            await self.send({"type": "chunk", "id": turn_id, "chunk": chunk})
+
+        session = self.chat_service.sessions[self.session_id]
+        await self.send({
+            "type": "done",
+            "id": turn_id,
+            "is_recipe": session.last_recipe_index == len(session.messages) - 1,
+            "allergen_warnings": session.allergen_warnings,
+        })
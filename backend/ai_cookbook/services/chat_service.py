@@ -3,102 +3,136 @@
 - 3페이지 흐름: 초기화 → 채팅 → 최종 레시피
 """
 
+import asyncio
+import logging
 import os
-import re
 import uuid
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Set, Tuple
 
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_qdrant import QdrantVectorStore
 from langchain_upstage import ChatUpstage, UpstageEmbeddings
 
+from config.settings import settings
+from services.allergen import AllergenScanner, LazyAllergenIndex, parse_allergies
+from services.http_client import get_async_http_client, get_http_client, get_http_stats
+from services.llm_scheduler import PRIORITY_CHAT, PRIORITY_INIT, LLMOverloaded, get_llm_scheduler
+from services.model_router import ROUTE_FAST, ROUTE_MAIN, RouteStats, build_routed_llm, classify_turn
+from services.prompt_layout import PromptCacheStats, build_rag_prompt
+from services.recipe_pages import get_recipe_page_store
+from services.recipe_detector import RecipeDetector, RecipeSignals, detect_recipe
+from services.retrieval import HybridRetriever, QdrantRetriever, aembed_queries, create_qdrant_client
+from services.semantic_cache import SemanticCache, cache_key
+from services.session_store import CompactChatHistory, HistoryCache, SessionRecord
+from services.sparse_index import LazyBM25Index
+from services.speculative import SpeculativeFinalizer
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def _docs_to_text(docs) -> str:
+    return "\n\n".join(doc.page_content for doc in docs)
+
 
 class ChatService:
     """RAG 기반 레시피 챗봇 서비스"""
 
     def __init__(self):
+        # 모든 LLM 호출은 공용 스케줄러를 거침 (동시성 / 토큰 예산 / 우선순위)
+        self.scheduler = get_llm_scheduler()
+        self.fast_llm = None  # 빠른 모델 (LLM_FAST_MODEL 설정 시)
         self._init_llm()
         self._init_embeddings()
         self._init_vector_store()
         self._init_rag_chain()
+        self._init_semantic_cache()
+        self._init_speculative()
 
-        # 세션별 데이터 저장소
-        self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.chat_histories: Dict[str, ChatMessageHistory] = {}
-        self.final_recipes: Dict[str, Dict[str, str]] = {}
+        # 세션별 데이터 저장소 (프로필 + 메시지 + 확정 레시피)
+        self.sessions: Dict[str, SessionRecord] = {}
+        # 히스토리 API 직렬화 캐시 (압축 블록 단위, 세션 공용 LRU)
+        self.history_cache = HistoryCache(settings.history_cache_max_blocks)
+        # 세션 이벤트 구독자 (WebSocket 연결별 큐)
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
 
     def _init_llm(self):
         self.llm = ChatUpstage(
             api_key=os.getenv("LLM_API_KEY"),
             base_url=os.getenv("LLM_BASE_URL"),
             model=os.getenv("LLM_MODEL"),
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            max_retries=0,  # 재시도는 공유 HTTP 클라이언트에서 처리
+            stream_usage=True,  # 스트리밍에서도 usage(cached token 포함) 수신
         )
+        # 짧은 추가 질문 / 잡담용 빠른 모델 (없으면 모든 턴을 메인 모델로)
+        if os.getenv("LLM_FAST_MODEL"):
+            self.fast_llm = ChatUpstage(
+                api_key=os.getenv("LLM_API_KEY"),
+                base_url=os.getenv("LLM_BASE_URL"),
+                model=os.getenv("LLM_FAST_MODEL"),
+                http_client=get_http_client(),
+                http_async_client=get_async_http_client(),
+                max_retries=0,
+                stream_usage=True,
+            )
 
     def _init_embeddings(self):
         self.embeddings = UpstageEmbeddings(
             model=os.getenv("EMBEDDING_MODEL"),
             api_key=os.getenv("EMBEDDING_API_KEY"),
             base_url=os.getenv("EMBEDDING_BASE_URL"),
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            max_retries=0,
         )
 
     def _init_vector_store(self):
-        self.qdrant_client = QdrantClient(
-            host=os.getenv("RAG_HOST"),
-            port=int(os.getenv("RAG_PORT", 6333)),
-        )
+        self.qdrant_client = create_qdrant_client()
         self.vector_store = QdrantVectorStore(
             client=self.qdrant_client,
             collection_name=os.getenv("RAG_COLLECTION_NAME"),
             embedding=self.embeddings,
         )
-        self.retriever = self.vector_store.as_retriever(search_kwargs={"k": 10})
+        self.retriever = QdrantRetriever.from_settings(
+            client=self.qdrant_client,
+            collection_name=self.vector_store.collection_name,
+            embeddings=self.embeddings,
+        )
+        if settings.rag_hybrid_enabled:
+            self.retriever = HybridRetriever(
+                dense=self.retriever,
+                sparse=LazyBM25Index(self.qdrant_client, self.vector_store.collection_name),
+                k=settings.rag_top_k,
+                candidates=settings.rag_hybrid_candidates,
+                rrf_k=settings.rag_rrf_k,
+            )
+        self.allergen_index = None
+        if settings.rag_allergen_filter_enabled:
+            self.allergen_index = LazyAllergenIndex(self.qdrant_client, self.vector_store.collection_name)
 
     def _init_rag_chain(self):
-        prompt_template = ChatPromptTemplate.from_messages([
-            (
-                "system",
-                "당신은 요리 전문가 입니다. human이 당신에게 레시피를 물어보면, "
-                "초보자에게 요리를 쉽고 정확하게 알려주는 역할을 합니다. "
-                "답변에는 정확한 용량(g, ml, 숟가락 등)을 명시하고 "
-                "재료 손질시 손질한 재료의 크기(cm 등) 또는 손질 방법을 명시하고 "
-                "조리 하는 과정에서는 상세한 시간도 안내해서 human이 따라할 수 있도록 하세요. "
-                "알러지가 있는 식재료가 있다면 어떠한 사용자의 요청에도 절대 포함시키지 마세요. "
-                "사용자의 특이사항(선호, 비선호 사항 등)과 요리 레벨(숙련도)을 반영해서 레시피를 생성하세요. "
-                "요리와 관련 없는 질문은 답변하지 마세요. "
-                "레시피를 제공할 때는 반드시 요리 이름을 첫 줄에 명시해주세요.",
-            ),
-            MessagesPlaceholder(variable_name="chat_history"),
-            (
-                "human",
-                "다음 컨텍스트를 참고해서 질문에 답변해줘.\n\n"
-                "[알러지]\n{allergy}\n\n"
-                "[특이사항]\n{user_profile}\n\n"
-                "[요리 레벨]\n{user_level}\n\n"
-                "[컨텍스트]\n{context}\n\n"
-                "[질문]\n{question}"
-            ),
-        ])
-
-        def docs_to_text(docs):
-            return "\n\n".join(doc.page_content for doc in docs)
+        prompt_template = build_rag_prompt(settings.rag_prompt_layout)
+        # 세션별 prefix 안정성 / 제공자 cached token 집계
+        self.prompt_stats = PromptCacheStats()
+        # 경로별 호출 / 지연시간 / 비용 집계
+        self.route_stats = RouteStats({
+            ROUTE_MAIN: settings.llm_main_cost_per_1k,
+            ROUTE_FAST: settings.llm_fast_cost_per_1k,
+        })
+        for llm in (self.llm, self.fast_llm):
+            if llm is not None:
+                llm.callbacks = [*(llm.callbacks or []), self.prompt_stats, self.route_stats]
 
         self.base_rag_chain = (
             {
-                "context": (
-                    RunnablePassthrough()
-                    .pick("question")
-                    | self.retriever
-                    | RunnableLambda(docs_to_text)
-                ),
+                "context": RunnableLambda(self._retrieve_context),
                 "question": RunnablePassthrough().pick("question"),
                 "chat_history": RunnablePassthrough().pick("chat_history"),
                 "allergy": RunnablePassthrough().pick("allergy"),
@@ -106,14 +140,48 @@ class ChatService:
                 "user_level": RunnablePassthrough().pick("user_level"),
             }
             | prompt_template
-            | self.llm
+            | build_routed_llm(self.llm, self.fast_llm)
             | StrOutputParser()
         )
 
-    def _get_session_history(self, session_id: str) -> ChatMessageHistory:
-        if session_id not in self.chat_histories:
-            self.chat_histories[session_id] = ChatMessageHistory()
-        return self.chat_histories[session_id]
+    def _init_semantic_cache(self):
+        self.semantic_cache = None
+        if settings.semantic_cache_enabled:
+            self.semantic_cache = SemanticCache(
+                threshold=settings.semantic_cache_threshold,
+                ttl_seconds=settings.semantic_cache_ttl_seconds,
+                max_entries=settings.semantic_cache_max_entries,
+            )
+
+    def _init_speculative(self):
+        self.speculative = None
+        if settings.speculative_finalize_enabled:
+            self.speculative = SpeculativeFinalizer(
+                build_record=self._build_final_record,
+                image_job=self._speculative_image_job if settings.speculative_image_enabled else None,
+                workers=settings.speculative_workers,
+                on_image=self._on_speculative_image,
+            )
+
+    def _excluded_ids(self, allergies: List[str]):
+        if allergies and self.allergen_index is not None:
+            return self.allergen_index.excluded_ids(allergies)
+        return None
+
+    def _retrieve_context(self, inputs: Dict[str, Any]) -> str:
+        """알러지 식재료가 포함된 청크를 제외하고 검색"""
+        if "context" in inputs:
+            # 배치 검색으로 미리 가져온 컨텍스트
+            return inputs["context"]
+        docs = self.retriever.search(
+            inputs["question"],
+            exclude_ids=self._excluded_ids(inputs.get("allergies") or []),
+            vector=inputs.get("question_vector"),
+        )
+        return _docs_to_text(docs)
+
+    def _get_session_history(self, session_id: str) -> CompactChatHistory:
+        return CompactChatHistory(self.sessions[session_id].messages)
 
     # ============ 1페이지: 세션 초기화 ============
 
@@ -130,23 +198,107 @@ class ChatService:
         session_id = str(uuid.uuid4())
 
         # 세션 정보 저장
-        self.sessions[session_id] = {
-            "allergy": allergy or [],
-            "preferences": preferences or "",
-            "cooking_level": cooking_level or "초보",
-            "food_type": food_type,
-            "is_finalized": False,
-        }
+        self.sessions[session_id] = SessionRecord(
+            allergy=parse_allergies(allergy),
+            preferences=preferences or "",
+            cooking_level=cooking_level or "초보",
+            food_type=food_type,
+        )
 
-        # 첫 번째 레시피 자동 생성
+        # 첫 번째 레시피 자동 생성 (채팅 턴보다 낮은 우선순위)
         initial_question = f"{food_type} 레시피를 알려줘"
-        result = self._run_chain(session_id, initial_question)
+        try:
+            result = self._run_chain(session_id, initial_question, priority=PRIORITY_INIT)
+        except LLMOverloaded:
+            del self.sessions[session_id]
+            raise
 
         return {
             "session_id": session_id,
             "initial_message": result["response"],
         }
 
+    async def init_sessions_batch(
+        self,
+        allergy: str,
+        preferences: str,
+        cooking_level: str,
+        food_types: List[str],
+    ):
+        """
+        여러 음식 종류의 세션을 한 번에 생성 (식단 계획용)
+        - 질의 임베딩 1회 + Qdrant 배치 검색 1회
+        - LLM 생성은 제한된 동시성으로 실행, 완료되는 순서대로 yield
+        """
+        allergies = parse_allergies(allergy)
+        questions = [f"{food_type} 레시피를 알려줘" for food_type in food_types]
+        try:
+            vectors = await aembed_queries(self.embeddings, questions)
+            # 알러지 인덱스 첫 구축(컬렉션 전체 scroll)도 스레드에서
+            docs_batch = await asyncio.to_thread(
+                lambda: self.retriever.search_batch(questions, vectors, self._excluded_ids(allergies))
+            )
+        except Exception as e:
+            # 검색 실패 - 세션을 만들지 않고 항목별 에러로 응답
+            logger.error(f"Batch retrieval failed: {e}")
+            for index, food_type in enumerate(food_types):
+                yield {"index": index, "food_type": food_type, "session_id": None, "error": str(e)}
+            return
+
+        # 검색이 성공한 뒤에 세션 생성
+        session_ids = []
+        for food_type in food_types:
+            session_id = str(uuid.uuid4())
+            self.sessions[session_id] = SessionRecord(
+                allergy=list(allergies),
+                preferences=preferences or "",
+                cooking_level=cooking_level or "초보",
+                food_type=food_type,
+            )
+            session_ids.append(session_id)
+        semaphore = asyncio.Semaphore(settings.batch_concurrency)
+
+        async def generate(index: int) -> Dict[str, Any]:
+            session_id = session_ids[index]
+            item = {"index": index, "food_type": food_types[index], "session_id": session_id}
+            try:
+                async with semaphore:
+                    inputs = self._chain_inputs(session_id, questions[index])
+                    inputs["context"] = _docs_to_text(docs_batch[index])
+                    cache_lookup = self._cache_lookup(session_id, inputs, vector=vectors[index])
+                    if cache_lookup.get("response") is not None:
+                        response = cache_lookup["response"]
+                        self._append_history(session_id, questions[index], response)
+                    else:
+                        config = {"configurable": {"session_id": session_id}}
+                        async with self.scheduler.aslot(PRIORITY_INIT):
+                            response = await self._chain_with_history().ainvoke(inputs, config=config)
+                result = self._finish_turn(session_id, questions[index], response, cache_lookup, detect_recipe(response))
+                item.update(initial_message=response, is_recipe=result["is_recipe"])
+            except Exception as e:
+                # 생성 실패 - init_session과 같이 세션을 지우고 session_id 없이 응답
+                if self.delete_session(session_id):  # 이미 지워졌으면 요청 취소로 인한 실패
+                    logger.error(f"Batch item {index} failed: {e}")
+                item.update(session_id=None, error=str(e))
+            return item
+
+        tasks = [asyncio.create_task(generate(index)) for index in range(len(food_types))]
+        delivered: Set[str] = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                if item["session_id"] is not None:
+                    delivered.add(item["session_id"])
+                yield item
+        finally:
+            # 클라이언트 연결이 끊기거나 요청이 취소되면 남은 생성 작업 취소,
+            # 전달되지 않은 세션은 삭제
+            for task in tasks:
+                task.cancel()
+            for session_id in session_ids:
+                if session_id not in delivered:
+                    self.delete_session(session_id)
+
     # ============ 2페이지: 채팅 ============
 
     def chat(self, session_id: str, message: str) -> Optional[Dict[str, Any]]:
@@ -163,86 +315,186 @@ class ChatService:
         async for chunk in self._run_chain_stream(session_id, message):
             yield chunk
 
-    def _run_chain(self, session_id: str, message: str) -> Dict[str, Any]:
-        """RAG 체인 실행"""
+    def _chain_inputs(self, session_id: str, message: str) -> Dict[str, Any]:
         profile = self.sessions[session_id]
-        allergy_str = ", ".join(profile["allergy"]) if profile["allergy"] else "없음"
+        allergy_str = ", ".join(profile.allergy) if profile.allergy else "없음"
+        return {
+            "question": message,
+            "allergy": allergy_str,
+            "allergies": profile.allergy,
+            "user_profile": profile.preferences,
+            "user_level": profile.cooking_level,
+        }
 
-        chain_with_history = RunnableWithMessageHistory(
+    def _chain_with_history(self) -> RunnableWithMessageHistory:
+        return RunnableWithMessageHistory(
             self.base_rag_chain,
             get_session_history=self._get_session_history,
             input_messages_key="question",
             history_messages_key="chat_history",
         )
 
-        config = {"configurable": {"session_id": session_id}}
-
-        response = chain_with_history.invoke(
-            {
-                "question": message,
-                "allergy": allergy_str,
-                "user_profile": profile["preferences"],
-                "user_level": profile["cooking_level"],
-            },
-            config=config,
-        )
-
-        is_recipe = self._is_recipe_response(response)
+    def _select_route(self, session_id: str, message: str) -> str:
+        """턴 분류 - 빠른 모델로 충분한 턴인지 로컬에서 판별"""
+        if self.fast_llm is None:
+            route = ROUTE_MAIN
+        else:
+            has_recipe = self.sessions[session_id].last_recipe_index is not None
+            route = classify_turn(message, has_recipe, settings.llm_fast_max_chars)
+        self.route_stats.record_decision(route)
+        return route
+
+    def _run_chain(self, session_id: str, message: str, priority: int = PRIORITY_CHAT) -> Dict[str, Any]:
+        """RAG 체인 실행"""
+        inputs = self._chain_inputs(session_id, message)
+        cache_lookup = self._cache_lookup(session_id, inputs)
 
-        # 레시피 응답이면 임시 저장 (최종 확정 전)
-        if is_recipe:
-            self.sessions[session_id]["last_recipe"] = {
-                "content": response,
-                "name": self._extract_recipe_name(response),
-            }
+        if cache_lookup.get("response") is not None:
+            response = cache_lookup["response"]
+            self._append_history(session_id, message, response)
+        else:
+            route = self._select_route(session_id, message)
+            config = {"configurable": {"session_id": session_id, "llm_route": route}}
+            with self.scheduler.slot(priority):
+                response = self._chain_with_history().invoke(inputs, config=config)
 
-        return {"response": response, "is_recipe": is_recipe}
+        return self._finish_turn(session_id, message, response, cache_lookup, detect_recipe(response))
 
     async def _run_chain_stream(self, session_id: str, message: str):
         """RAG 체인 실행 (스트리밍)"""
-        profile = self.sessions[session_id]
-        allergy_str = ", ".join(profile["allergy"]) if profile["allergy"] else "없음"
+        inputs = self._chain_inputs(session_id, message)
+        cache_lookup = await self._acache_lookup(session_id, inputs)
 
-        chain_with_history = RunnableWithMessageHistory(
-            self.base_rag_chain,
-            get_session_history=self._get_session_history,
-            input_messages_key="question",
-            history_messages_key="chat_history",
-        )
+        # 전체 응답을 모아서 나중에 히스토리에 저장, 레시피 여부는 토큰 단위로 누적 판별
+        full_response = ""
+        detector = RecipeDetector()
+
+        if cache_lookup.get("response") is not None:
+            full_response = cache_lookup["response"]
+            self._append_history(session_id, message, full_response)
+            detector.feed(full_response)
+            yield full_response
+        else:
+            route = self._select_route(session_id, message)
+            config = {"configurable": {"session_id": session_id, "llm_route": route}}
+            async with self.scheduler.aslot(PRIORITY_CHAT):
+                async for chunk in self._chain_with_history().astream(inputs, config=config):
+                    full_response += chunk
+                    detector.feed(chunk)
+                    yield chunk
+
+        # 스트리밍 완료 후 알러지 검사, 캐시 저장, 레시피 저장
+        self._finish_turn(session_id, message, full_response, cache_lookup, detector.finish())
+
+    def _finish_turn(
+        self,
+        session_id: str,
+        message: str,
+        response: str,
+        cache_lookup: Dict[str, Any],
+        signals: RecipeSignals,
+    ) -> Dict[str, Any]:
+        allergen_warnings = self._scan_allergens(session_id, response)
+        self._cache_store(cache_lookup, message, response, allergen_warnings)
+        self._record_recipe(session_id, response, signals)
+        return {"response": response, "is_recipe": signals.is_recipe, "allergen_warnings": allergen_warnings}
 
-        config = {"configurable": {"session_id": session_id}}
+    # ============ 의미 기반 캐시 ============
 
-        # 전체 응답을 모아서 나중에 히스토리에 저장
-        full_response = ""
+    def _cache_lookup(
+        self,
+        session_id: str,
+        inputs: Dict[str, Any],
+        vector: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """캐시 조회 - 질문 임베딩은 검색 단계에서도 재사용"""
+        if self.semantic_cache is None:
+            return {}
 
-        async for chunk in chain_with_history.astream(
-            {
-                "question": message,
-                "allergy": allergy_str,
-                "user_profile": profile["preferences"],
-                "user_level": profile["cooking_level"],
-            },
-            config=config,
-        ):
-            full_response += chunk
-            yield chunk
+        session = self.sessions[session_id]
+        key = cache_key(
+            session.allergy,
+            session.preferences,
+            session.cooking_level,
+            session.last_recipe_content() or "",
+        )
+        vector = vector or self.embeddings.embed_query(inputs["question"])
+        inputs["question_vector"] = vector
 
-        # 스트리밍 완료 후 레시피 확인 및 저장
-        is_recipe = self._is_recipe_response(full_response)
-        if is_recipe:
-            self.sessions[session_id]["last_recipe"] = {
-                "content": full_response,
-                "name": self._extract_recipe_name(full_response),
-            }
+        entry = self.semantic_cache.lookup(key, vector)
+        if entry is not None and AllergenScanner(session.allergy).scan(entry.response):
+            # 알러지 재검증 실패 - 캐시 응답을 쓰지 않고 새로 생성
+            self.semantic_cache.reject(entry)
+            entry = None
 
-    def get_chat_history(self, session_id: str) -> Optional[List[Dict[str, str]]]:
-        if session_id not in self.chat_histories:
+        return {
+            "key": key,
+            "vector": vector,
+            "response": entry.response if entry is not None else None,
+        }
+
+    async def _acache_lookup(self, session_id: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """캐시 조회 (비동기) - 질문 임베딩이 이벤트 루프를 막지 않도록"""
+        if self.semantic_cache is None:
+            return {}
+        vector = await self.embeddings.aembed_query(inputs["question"])
+        return self._cache_lookup(session_id, inputs, vector=vector)
+
+    def _cache_store(
+        self,
+        cache_lookup: Dict[str, Any],
+        message: str,
+        response: str,
+        allergen_warnings: List[Dict[str, str]],
+    ):
+        # 캐시에서 나온 응답, 알러지 경고가 있는 응답은 저장하지 않음
+        if not cache_lookup or cache_lookup["response"] is not None or allergen_warnings:
+            return
+        self.semantic_cache.store(cache_lookup["key"], cache_lookup["vector"], message, response)
+
+    def _append_history(self, session_id: str, message: str, response: str):
+        history = self._get_session_history(session_id)
+        history.add_user_message(message)
+        history.add_ai_message(response)
+
+    def _record_recipe(self, session_id: str, response: str, signals: RecipeSignals):
+        """레시피 응답이면 임시 저장 (최종 확정 전) + 히스토리 위치 색인"""
+        if not signals.is_recipe:
+            return
+        session = self.sessions[session_id]
+        recipe_index = len(session.messages) - 1
+        session.recipe_messages.append(recipe_index)
+        session.recipe_name = signals.name
+        session.recipe_has_ingredients = signals.has_ingredients
+        session.recipe_step_count = signals.step_count
+        # 확정 버튼을 누르기 전에 최종 레시피 / 이미지 작업을 미리 시작
+        if self.speculative is not None:
+            self.speculative.submit(session_id, signals.name, recipe_index, response)
+
+    def get_history_page(
+        self,
+        session_id: str,
+        since: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        히스토리 페이지 조회 (since 위치부터 최대 limit개)
+        - 항목은 JSON 직렬화된 bytes (압축 블록 단위 공용 캐시)
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
             return None
-        history = self.chat_histories[session_id]
-        return [
-            {"role": "user" if msg.type == "human" else "assistant", "content": msg.content}
-            for msg in history.messages
-        ]
+
+        version = session.history_version
+        items, total = self.history_cache.page(session_id, session.messages, since, limit)
+        end = min(since, total) + len(items)
+        return {
+            "items": items,
+            "total": total,
+            "next_cursor": end,
+            "has_more": end < total,
+            "version": version,
+        }
 
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """세션 정보 조회"""
@@ -250,11 +502,11 @@ class ChatService:
             return None
         session = self.sessions[session_id]
         return {
-            "allergy": session["allergy"],
-            "preferences": session["preferences"],
-            "cooking_level": session["cooking_level"],
-            "food_type": session["food_type"],
-            "is_finalized": session.get("is_finalized", False),
+            "allergy": session.allergy,
+            "preferences": session.preferences,
+            "cooking_level": session.cooking_level,
+            "food_type": session.food_type,
+            "is_finalized": session.is_finalized,
         }
 
     # ============ 2→3페이지: 레시피 확정 ============
@@ -269,58 +521,67 @@ class ChatService:
             return None
 
         session = self.sessions[session_id]
-        last_recipe = session.get("last_recipe")
-
-        if not last_recipe:
-            # 마지막 레시피가 없으면 히스토리에서 찾기
-            history = self.get_chat_history(session_id)
-            if history:
-                for msg in reversed(history):
-                    if msg["role"] == "assistant" and self._is_recipe_response(msg["content"]):
-                        last_recipe = {
-                            "content": msg["content"],
-                            "name": self._extract_recipe_name(msg["content"]),
-                        }
-                        break
-
-        if not last_recipe:
+        recipe_index = session.last_recipe_index
+        if recipe_index is None:
             return None
 
-        # 최종 레시피 저장
-        recipe_name = last_recipe["name"]
-        recipe_content = last_recipe["content"]
-
-        self.final_recipes[session_id] = {
-            "recipe_name": recipe_name,
-            "recipe_content": recipe_content,
-            "image_prompt": self._generate_image_prompt(recipe_name, recipe_content),
-        }
-
-        session["is_finalized"] = True
+        # 최종 레시피 저장 (미리 계산된 결과가 있으면 그대로 사용, 본문은 메시지 인덱스로 참조)
+        prepared = self.speculative.take(session_id, recipe_index) if self.speculative else None
+        session.final = prepared or self._build_final_record(
+            session.recipe_name, recipe_index, session.messages[recipe_index][1]
+        )
+        session.is_finalized = True
+        self._publish_page(session)
 
-        return self.final_recipes[session_id]
+        final_view = self._final_recipe_view(session)
+        self._publish(session_id, {"type": "finalized", **final_view})
+        return final_view
 
     # ============ 3페이지: 최종 레시피 조회 ============
 
     def get_final_recipe(self, session_id: str) -> Optional[Dict[str, str]]:
         """확정된 최종 레시피 조회"""
-        return self.final_recipes.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is None or session.final is None:
+            return None
+        return self._final_recipe_view(session)
+
+    def _final_recipe_view(self, session: SessionRecord) -> Dict[str, Any]:
+        final = session.final
+        return {**final, "recipe_content": session.messages[final["recipe_index"]][1]}
 
     # ============ 유틸리티 ============
 
-    def _is_recipe_response(self, response: str) -> bool:
-        keywords = ["재료", "만드는 방법", "조리", "손질", "끓이", "볶", "굽", "찌"]
-        return any(kw in response for kw in keywords)
+    def _scan_allergens(self, session_id: str, response: str) -> List[Dict[str, str]]:
+        """최종 응답에 알러지 식재료가 남아있는지 검사"""
+        session = self.sessions[session_id]
+        scanner = AllergenScanner(session.allergy)
+        warnings = scanner.scan(response) if scanner else []
+        session.allergen_warnings = warnings
+        return warnings
 
-    def _extract_recipe_name(self, response: str) -> str:
-        lines = response.strip().split("\n")
-        for line in lines[:3]:
-            line = line.strip()
-            if line and not line.startswith("-") and not line.startswith("*"):
-                name = re.sub(r"[#*\[\]()]", "", line).strip()
-                if name and len(name) < 50:
-                    return name
-        return "레시피"
+    def _build_final_record(self, recipe_name: str, recipe_index: int, recipe_content: str) -> Dict[str, Any]:
+        return {
+            "recipe_name": recipe_name,
+            "recipe_index": recipe_index,
+            "image_prompt": self._generate_image_prompt(recipe_name, recipe_content),
+        }
+
+    def _publish_page(self, session: SessionRecord):
+        """확정 레시피를 정적 페이지로 렌더링 (공유 링크는 세션 없이 디스크에서 서빙)"""
+        if not settings.recipe_pages_enabled:
+            return
+        try:
+            urls = get_recipe_page_store().publish(self._final_recipe_view(session))
+        except Exception as e:
+            logger.warning(f"Recipe page publish failed: {e}")
+            return
+        session.final.update(urls)
+
+    def _speculative_image_job(self, image_prompt: str) -> str:
+        # selenium은 이미지 생성을 켤 때만 필요한 선택 의존성
+        from services.image_generator import ImageGenerator
+        return ImageGenerator().generate_image(image_prompt)
 
     def _generate_image_prompt(self, recipe_name: str, recipe_content: str) -> str:
         return (
@@ -329,10 +590,69 @@ class ChatService:
             f"top-down view, garnished elegantly"
         )
 
+    # ============ 세션 이벤트 (WebSocket 푸시) ============
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ws_event_buffer)
+        self._subscribers.setdefault(session_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue):
+        subscribers = [(loop, q) for loop, q in self._subscribers.get(session_id, []) if q is not queue]
+        if subscribers:
+            self._subscribers[session_id] = subscribers
+        else:
+            self._subscribers.pop(session_id, None)
+
+    def _publish(self, session_id: str, event: Dict[str, Any]):
+        # 백그라운드 스레드(이미지 작업)에서도 호출되므로 이벤트 루프로 넘겨서 전달
+        for loop, queue in list(self._subscribers.get(session_id, [])):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 구독자는 이벤트를 버림 (최신 상태는 REST로 조회 가능)
+            logger.warning(f"Dropping session event: {event.get('type')}")
+
+    def _on_speculative_image(self, session_id: str, record: Dict[str, Any]):
+        session = self.sessions.get(session_id)
+        if session is not None and session.final is record:
+            # 확정 후 이미지가 도착하면 이미지가 포함된 페이지로 다시 렌더링 (새 해시 URL)
+            self._publish_page(session)
+        self._publish(session_id, {
+            "type": "image",
+            "recipe_name": record["recipe_name"],
+            "image_url": record.get("image_url"),
+            "page_url": record.get("page_url"),
+        })
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """운영 지표 조회"""
+        return {
+            "http": get_http_stats(),
+            "semantic_cache": self.semantic_cache.stats() if self.semantic_cache else None,
+            "speculative": self.speculative.stats() if self.speculative else None,
+            "llm_scheduler": self.scheduler.stats(),
+            "prompt_cache": self.prompt_stats.stats(),
+            "model_routing": self.route_stats.stats(),
+            "history_cache": self.history_cache.stats(),
+        }
+
     def delete_session(self, session_id: str) -> bool:
         if session_id not in self.sessions:
             return False
         del self.sessions[session_id]
-        self.chat_histories.pop(session_id, None)
-        self.final_recipes.pop(session_id, None)
-        return True
\ No newline at end of file
+        self.prompt_stats.discard(session_id)
+        self.history_cache.discard(session_id)
+        if self.speculative is not None:
+            self.speculative.discard(session_id)
+        return True
+
+    def close(self):
+        """백그라운드 작업 정리"""
+        if self.speculative is not None:
+            self.speculative.shutdown()
\ No newline at end of file
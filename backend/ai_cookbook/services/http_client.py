@@ -0,0 +1,224 @@
+"""
+공유 HTTP 클라이언트 - LLM / 임베딩 / 번역 클라이언트가 함께 쓰는 커넥션 풀
+- 풀 크기, keep-alive, HTTP/2, 타임아웃 설정 (config.settings)
+- 429/5xx 응답 재시도 (지수 백오프 + Retry-After)
+- 커넥션 재사용 통계
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from config.settings import settings
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class HttpClientStats:
+    """요청 / 재시도 / 신규 커넥션 카운터"""
+
+    FIELDS = (
+        "requests",
+        "attempts",
+        "responses",
+        "retries",
+        "new_connections",
+        "status_429",
+        "status_5xx",
+        "transport_errors",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {field: 0 for field in self.FIELDS}
+
+    def incr(self, field: str, amount: int = 1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def record_status(self, status_code: int):
+        if status_code == 429:
+            self.incr("status_429")
+        elif status_code >= 500:
+            self.incr("status_5xx")
+
+    def on_trace(self, event_name: str):
+        # httpcore trace 이벤트: TCP 연결이 새로 맺어질 때만 카운트
+        if event_name == "connection.connect_tcp.complete":
+            self.incr("new_connections")
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._counts)
+        reused = max(data["responses"] - data["new_connections"], 0)
+        data["reused_connections"] = reused
+        data["reuse_ratio"] = round(reused / data["responses"], 4) if data["responses"] else 0.0
+        return data
+
+
+def _backoff_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Retry-After 헤더 우선, 없으면 지수 백오프 + jitter"""
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.http_backoff_max)
+            except ValueError:
+                pass
+    delay = min(settings.http_backoff_base * (2 ** attempt), settings.http_backoff_max)
+    return delay * (0.5 + random.random() / 2)
+
+
+def _transport_kwargs() -> Dict[str, Any]:
+    return {
+        "http2": settings.http2_enabled,
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+    }
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.http_read_timeout, connect=settings.http_connect_timeout)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """동기 클라이언트용 재시도 transport"""
+
+    def __init__(self, stats: HttpClientStats, **kwargs):
+        self._transport = httpx.HTTPTransport(**kwargs)
+        self._stats = stats
+
+    def _trace(self, event_name: str, info: Dict[str, Any]):
+        self._stats.on_trace(event_name)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.incr("requests")
+        request.extensions["trace"] = self._trace
+        max_retries = settings.http_max_retries
+
+        for attempt in range(max_retries + 1):
+            self._stats.incr("attempts")
+            try:
+                response = self._transport.handle_request(request)
+            except RETRY_EXCEPTIONS:
+                self._stats.incr("transport_errors")
+                if attempt >= max_retries:
+                    raise
+                time.sleep(_backoff_delay(attempt, None))
+                self._stats.incr("retries")
+                continue
+
+            self._stats.incr("responses")
+            self._stats.record_status(response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+
+            delay = _backoff_delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+            self._stats.incr("retries")
+
+        raise RuntimeError("unreachable")
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """비동기 클라이언트용 재시도 transport"""
+
+    def __init__(self, stats: HttpClientStats, **kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**kwargs)
+        self._stats = stats
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        self._stats.on_trace(event_name)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.incr("requests")
+        request.extensions["trace"] = self._trace
+        max_retries = settings.http_max_retries
+
+        for attempt in range(max_retries + 1):
+            self._stats.incr("attempts")
+            try:
+                response = await self._transport.handle_async_request(request)
+            except RETRY_EXCEPTIONS:
+                self._stats.incr("transport_errors")
+                if attempt >= max_retries:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt, None))
+                self._stats.incr("retries")
+                continue
+
+            self._stats.incr("responses")
+            self._stats.record_status(response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+
+            delay = _backoff_delay(attempt, response)
+            await response.aclose()
+            await asyncio.sleep(delay)
+            self._stats.incr("retries")
+
+        raise RuntimeError("unreachable")
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# ============ 프로세스 공유 클라이언트 ============
+
+_sync_stats = HttpClientStats()
+_async_stats = HttpClientStats()
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """공유 동기 HTTP 클라이언트"""
+    global _sync_client
+    with _client_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(
+                transport=RetryTransport(_sync_stats, **_transport_kwargs()),
+                timeout=_timeout(),
+            )
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """공유 비동기 HTTP 클라이언트"""
+    global _async_client
+    with _client_lock:
+        if _async_client is None:
+            _async_client = httpx.AsyncClient(
+                transport=AsyncRetryTransport(_async_stats, **_transport_kwargs()),
+                timeout=_timeout(),
+            )
+        return _async_client
+
+
+async def aclose_http_clients():
+    """앱 종료 시 커넥션 풀 정리"""
+    global _sync_client, _async_client
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def get_http_stats() -> Dict[str, Dict[str, Any]]:
+    """커넥션 재사용 통계"""
+    return {"sync": _sync_stats.to_dict(), "async": _async_stats.to_dict()}
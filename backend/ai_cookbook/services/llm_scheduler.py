@@ -0,0 +1,264 @@
+"""
+LLM 호출 스케줄러 - 모든 업스트림 LLM 호출의 입장 제어
+- 전역 동시성 한도 + 분당 토큰 예산 (토큰 버킷)
+- 우선순위 큐: 채팅 턴 > 세션 초기화 > 번역 / 백그라운드 작업
+- 예상 대기 시간이 우선순위별 SLO를 넘으면 즉시 차단 (503 + Retry-After)
+- 대기 시간 / 차단 횟수 통계
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+
+PRIORITY_CHAT = 0
+PRIORITY_INIT = 1
+PRIORITY_BACKGROUND = 2  # 번역, 투기적 작업
+PRIORITY_NAMES = ("chat", "init", "background")
+
+
+class LLMOverloaded(Exception):
+    """대기 SLO 안에 처리할 수 없어 요청을 차단함"""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"LLM 요청이 많습니다. {self.retry_after}초 후 다시 시도해주세요.")
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    deadline: float = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+    removed: bool = field(default=False, compare=False)
+
+
+class LLMScheduler:
+    """동시성 / 토큰 예산 / 우선순위 기반 LLM 호출 스케줄러"""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_slo: List[float],
+        tokens_per_minute: int = 0,
+        tokens_per_call: int = 2000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_slo = queue_slo
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens_per_call = tokens_per_call
+        self._lock = threading.Lock()
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._running: Dict[int, float] = {}  # 실행 중인 호출의 시작 시각 (seq → monotonic)
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._service_time = 2.0  # 호출 1회 평균 소요 시간 (EWMA, 초)
+        self._waits = [deque(maxlen=512) for _ in PRIORITY_NAMES]
+        self._stats = [{"admitted": 0, "shed": 0, "expired": 0} for _ in PRIORITY_NAMES]
+
+    # ============ 입장 ============
+
+    @contextmanager
+    def slot(self, priority: int, tokens: Optional[int] = None):
+        """동기 호출용 - 슬롯을 받을 때까지 대기"""
+        event = threading.Event()
+        waiter = self._enqueue(priority, tokens, event.set)
+        if not event.wait(timeout=max(waiter.deadline - time.monotonic(), 0)):
+            self._expire(waiter)
+        try:
+            yield
+        finally:
+            self._release(waiter)
+
+    @asynccontextmanager
+    async def aslot(self, priority: int, tokens: Optional[int] = None):
+        """비동기 호출용 - 이벤트 루프를 막지 않고 대기"""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            if not granted.done():
+                granted.set_result(None)
+
+        def wake():
+            loop.call_soon_threadsafe(grant)
+
+        waiter = self._enqueue(priority, tokens, wake)
+        try:
+            await asyncio.wait_for(asyncio.shield(granted), timeout=max(waiter.deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            self._expire(waiter)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(waiter)
+
+    def _enqueue(self, priority: int, tokens: Optional[int], wake: Callable[[], None]) -> _Waiter:
+        now = time.monotonic()
+        tokens = tokens or self.tokens_per_call
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)  # 예산보다 큰 요청도 언젠가는 실행되도록
+        with self._lock:
+            self._refill(now)
+            estimate = self._estimate_wait(priority, tokens)
+            slo = self.queue_slo[priority]
+            if estimate > slo:
+                self._stats[priority]["shed"] += 1
+                raise LLMOverloaded(estimate)
+            waiter = _Waiter(priority, next(self._seq), tokens, now + slo, now, wake)
+            heapq.heappush(self._heap, waiter)
+            self._dispatch(now)
+            return waiter
+
+    def _estimate_wait(self, priority: int, tokens: int) -> float:
+        # 같거나 높은 우선순위 대기열만 앞에 선다고 가정
+        ahead = [w for w in self._heap if not w.removed and w.priority <= priority]
+        free = self.max_concurrency - len(self._running)
+        if len(ahead) < free or not self._running:
+            slot_wait = 0.0  # 슬롯은 남아 있음 (토큰 예산 대기만 있을 수 있음)
+        else:
+            # 실행 중인 호출의 남은 시간(평균 소요 시간 기준)으로 슬롯이 비는 시점 추정
+            now = time.monotonic()
+            remaining = sorted(max(self._service_time - (now - started), 0.0) for started in self._running.values())
+            position = len(ahead) - free
+            slot_wait = remaining[position % len(remaining)] + position // self.max_concurrency * self._service_time
+        token_wait = 0.0
+        if self.tokens_per_minute:
+            deficit = sum(w.tokens for w in ahead) + tokens - self._tokens
+            token_wait = max(deficit, 0) / (self.tokens_per_minute / 60)
+        return max(slot_wait, token_wait)
+
+    def _expire(self, waiter: _Waiter):
+        with self._lock:
+            if waiter.granted:
+                return  # 타임아웃과 동시에 슬롯을 받은 경우
+            waiter.removed = True
+            self._stats[waiter.priority]["expired"] += 1
+        raise LLMOverloaded(self._service_time)
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            if not waiter.granted:
+                waiter.removed = True
+                return
+        self._release(waiter, completed=False)
+
+    def _release(self, waiter: _Waiter, completed: bool = True):
+        now = time.monotonic()
+        with self._lock:
+            started = self._running.pop(waiter.seq)
+            if completed:
+                self._service_time = 0.8 * self._service_time + 0.2 * (now - started)
+            self._dispatch(now)
+
+    # ============ 배정 (lock 안에서 호출) ============
+
+    def _refill(self, now: float):
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60,
+            )
+        self._refilled_at = now
+
+    def _dispatch(self, now: float):
+        self._refill(now)
+        while self._heap and len(self._running) < self.max_concurrency:
+            head = self._heap[0]
+            if head.removed:
+                heapq.heappop(self._heap)
+                continue
+            if self.tokens_per_minute and self._tokens < head.tokens:
+                self._schedule_refill((head.tokens - self._tokens) / (self.tokens_per_minute / 60))
+                return
+            heapq.heappop(self._heap)
+            self._running[head.seq] = now
+            self._tokens -= head.tokens if self.tokens_per_minute else 0
+            head.granted = True
+            self._stats[head.priority]["admitted"] += 1
+            self._waits[head.priority].append(now - head.enqueued_at)
+            head.wake()
+
+    def _schedule_refill(self, delay: float):
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(delay, self._on_refill)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_refill(self):
+        with self._lock:
+            self._timer = None
+            self._dispatch(time.monotonic())
+
+    # ============ 통계 ============
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queued = [0] * len(PRIORITY_NAMES)
+            for waiter in self._heap:
+                if not waiter.removed:
+                    queued[waiter.priority] += 1
+            data: Dict[str, Any] = {
+                "active": len(self._running),
+                "max_concurrency": self.max_concurrency,
+                "service_time_ms": round(self._service_time * 1000, 1),
+                "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+            }
+            for priority, name in enumerate(PRIORITY_NAMES):
+                waits = sorted(self._waits[priority])
+                data[name] = {
+                    **self._stats[priority],
+                    "queued": queued[priority],
+                    "queue_slo_ms": round(self.queue_slo[priority] * 1000),
+                    "wait_p50_ms": percentile_ms(waits, 0.50),
+                    "wait_p95_ms": percentile_ms(waits, 0.95),
+                    "wait_max_ms": percentile_ms(waits, 1.0),
+                }
+        return data
+
+
+def percentile_ms(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return round(sorted_values[index] * 1000, 1)
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """프로세스 공용 스케줄러 (ChatService와 번역기가 함께 사용)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(
+                max_concurrency=settings.llm_max_concurrency,
+                queue_slo=[
+                    settings.llm_chat_queue_slo,
+                    settings.llm_init_queue_slo,
+                    settings.llm_background_queue_slo,
+                ],
+                tokens_per_minute=settings.llm_tokens_per_minute,
+                tokens_per_call=settings.llm_tokens_per_call,
+            )
+        return _scheduler
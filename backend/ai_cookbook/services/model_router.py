@@ -0,0 +1,137 @@
+"""
+모델 라우팅 - 턴마다 빠른 모델 / 메인 모델 선택
+- 로컬 휴리스틱으로 분류 (레시피 생성·수정 키워드는 Aho-Corasick 한 번 스캔)
+  · 레시피 생성/수정 요청, 아직 레시피가 없는 세션, 긴 메시지 → 메인 모델
+  · 짧은 추가 질문, 인사, 요리와 무관한 질문(거절 응답) → 빠른 모델
+- 빠른 모델 실패 시 메인 모델로 fallback (LangChain with_fallbacks)
+- 경로별 호출 수 / 실패 / 지연시간 / 토큰 / 비용 통계 (LLM 콜백)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import ConfigurableField, Runnable
+
+from services.aho_corasick import AhoCorasick
+from services.llm_scheduler import percentile_ms
+
+ROUTE_MAIN = "main"
+ROUTE_FAST = "fast"
+ROUTES = (ROUTE_MAIN, ROUTE_FAST)
+
+# 레시피를 새로 만들거나 바꿔야 하는 요청
+RECIPE_REQUEST_KEYWORDS = [
+    "레시피", "만들", "만드는", "추천", "바꿔", "바꾸", "변경", "대신", "빼고", "빼줘",
+    "넣어", "추가", "인분", "맵게", "덜 맵", "싱겁", "짜게", "달게", "간단하게", "자세히", "다른",
+]
+
+_REQUEST_AUTOMATON = AhoCorasick(RECIPE_REQUEST_KEYWORDS)
+
+
+def classify_turn(message: str, has_recipe: bool, fast_max_chars: int = 40) -> str:
+    """턴 분류 - 메인 모델이 필요한 턴인지 로컬에서 판별"""
+    text = message.strip()
+    if not has_recipe or len(text) > fast_max_chars:
+        return ROUTE_MAIN
+    if _REQUEST_AUTOMATON.find(text):
+        return ROUTE_MAIN
+    return ROUTE_FAST
+
+
+def build_routed_llm(main_llm: BaseChatModel, fast_llm: Optional[BaseChatModel]) -> Runnable:
+    """
+    config의 configurable.llm_route로 모델을 고르는 LLM
+    - fast: 빠른 모델, 실패하면 메인 모델로 재시도
+    """
+    main = main_llm.with_config(metadata={"model_route": ROUTE_MAIN})
+    if fast_llm is None:
+        return main
+    fast = fast_llm.with_config(metadata={"model_route": ROUTE_FAST}).with_fallbacks([main])
+    return main.configurable_alternatives(
+        ConfigurableField(id="llm_route"),
+        default_key=ROUTE_MAIN,
+        **{ROUTE_FAST: fast},
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    # usage를 주지 않는 모델용 근사치 (한국어 기준 약 2글자당 1토큰)
+    return max(len(text) // 2, 1) if text else 0
+
+
+class RouteStats(BaseCallbackHandler):
+    """LLM 콜백 - 경로별 호출 / 실패 / 지연시간 / 토큰 / 비용"""
+
+    def __init__(self, cost_per_1k_tokens: Optional[Dict[str, float]] = None):
+        self.cost_per_1k_tokens = cost_per_1k_tokens or {}
+        self._lock = threading.Lock()
+        self._runs: Dict[UUID, tuple] = {}  # run_id → (route, 시작 시각, 프롬프트 토큰 근사치)
+        self._latencies = {route: deque(maxlen=512) for route in ROUTES}
+        self._stats = {
+            route: {"routed": 0, "calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0}
+            for route in ROUTES
+        }
+
+    def record_decision(self, route: str):
+        with self._lock:
+            self._stats[route]["routed"] += 1
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ):
+        route = (metadata or {}).get("model_route", ROUTE_MAIN)
+        prompt_tokens = sum(_estimate_tokens(str(m.content)) for m in messages[0]) if messages else 0
+        with self._lock:
+            self._runs[run_id] = (route, time.monotonic(), prompt_tokens)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        route, started, prompt_tokens = run
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens") or prompt_tokens
+        output_tokens = usage.get("output_tokens") or _estimate_tokens(getattr(generation, "text", ""))
+        with self._lock:
+            stats = self._stats[route]
+            stats["calls"] += 1
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            self._latencies[route].append(time.monotonic() - started)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is not None:
+                # 빠른 모델의 실패는 메인 모델 fallback으로 이어짐
+                self._stats[run[0]]["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = {}
+            for route in ROUTES:
+                stats = dict(self._stats[route])
+                latencies = sorted(self._latencies[route])
+                stats["latency_p50_ms"] = percentile_ms(latencies, 0.50)
+                stats["latency_p95_ms"] = percentile_ms(latencies, 0.95)
+                tokens = stats["input_tokens"] + stats["output_tokens"]
+                stats["cost"] = round(tokens / 1000 * self.cost_per_1k_tokens.get(route, 0.0), 6)
+                data[route] = stats
+        data[ROUTE_FAST]["fallbacks"] = data[ROUTE_FAST]["errors"]
+        return data
+
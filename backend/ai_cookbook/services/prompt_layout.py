@@ -0,0 +1,159 @@
+"""
+프롬프트 구성 - 제공자 측 prefix 캐시에 유리한 배치
+- prefix_cache: [시스템 지시 + 세션 프로필] → [이전 대화] → [질문 + 검색 컨텍스트]
+  (턴마다 바뀌는 검색 컨텍스트는 항상 마지막)
+- legacy: 프로필 / 컨텍스트 / 질문을 마지막 human 메시지에 함께 배치 (기존 방식)
+- 세션별 prefix 안정성 / 제공자 usage의 cached token 통계
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from services.semantic_cache import fingerprint
+
+LAYOUT_PREFIX_CACHE = "prefix_cache"
+LAYOUT_LEGACY = "legacy"
+
+SYSTEM_INSTRUCTIONS = (
+    "당신은 요리 전문가 입니다. human이 당신에게 레시피를 물어보면, "
+    "초보자에게 요리를 쉽고 정확하게 알려주는 역할을 합니다. "
+    "답변에는 정확한 용량(g, ml, 숟가락 등)을 명시하고 "
+    "재료 손질시 손질한 재료의 크기(cm 등) 또는 손질 방법을 명시하고 "
+    "조리 하는 과정에서는 상세한 시간도 안내해서 human이 따라할 수 있도록 하세요. "
+    "알러지가 있는 식재료가 있다면 어떠한 사용자의 요청에도 절대 포함시키지 마세요. "
+    "사용자의 특이사항(선호, 비선호 사항 등)과 요리 레벨(숙련도)을 반영해서 레시피를 생성하세요. "
+    "요리와 관련 없는 질문은 답변하지 마세요. "
+    "레시피를 제공할 때는 반드시 요리 이름을 첫 줄에 명시해주세요."
+)
+
+PROFILE_BLOCK = (
+    "[알러지]\n{allergy}\n\n"
+    "[특이사항]\n{user_profile}\n\n"
+    "[요리 레벨]\n{user_level}"
+)
+
+
+def build_rag_prompt(layout: str = LAYOUT_PREFIX_CACHE) -> ChatPromptTemplate:
+    if layout == LAYOUT_LEGACY:
+        return ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_INSTRUCTIONS),
+            MessagesPlaceholder(variable_name="chat_history"),
+            (
+                "human",
+                "다음 컨텍스트를 참고해서 질문에 답변해줘.\n\n"
+                f"{PROFILE_BLOCK}\n\n"
+                "[컨텍스트]\n{context}\n\n"
+                "[질문]\n{question}"
+            ),
+        ])
+
+    # 모든 세션이 공유하는 지시문 → 세션 프로필 → 이전 대화 순으로 고정, 바뀌는 부분은 끝에만
+    return ChatPromptTemplate.from_messages([
+        ("system", f"{SYSTEM_INSTRUCTIONS}\n\n[사용자 정보]\n{PROFILE_BLOCK}"),
+        MessagesPlaceholder(variable_name="chat_history"),
+        (
+            "human",
+            "[질문]\n{question}\n\n"
+            "[컨텍스트]\n{context}\n\n"
+            "위 컨텍스트를 참고해서 질문에 답변해줘."
+        ),
+    ])
+
+
+def _message_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def prompt_fingerprint(messages: Sequence[BaseMessage]) -> List[Tuple[str, int]]:
+    """메시지별 (해시, 글자 수) - 프롬프트 원문을 보관하지 않고 prefix 비교"""
+    return [(fingerprint(f"{m.type}\x00{_message_text(m)}"), len(_message_text(m))) for m in messages]
+
+
+def stable_prefix(previous: List[Tuple[str, int]], current: List[Tuple[str, int]]) -> Tuple[int, bool]:
+    """
+    이전 프롬프트와 앞에서부터 같은 메시지들의 글자 수, prefix 유지 여부
+    - 유지 = 이전 프롬프트의 마지막(휘발성) 메시지를 제외한 부분이 그대로 앞에 남아 있음
+    """
+    matched = 0
+    chars = 0
+    for before, after in zip(previous, current):
+        if before != after:
+            break
+        matched += 1
+        chars += after[1]
+    return chars, matched >= len(previous) - 1
+
+
+class PromptCacheStats(BaseCallbackHandler):
+    """LLM 콜백 - 세션별 prefix 안정성 + cached token 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prefixes: Dict[str, List[Tuple[str, int]]] = {}
+        self._stats = {
+            "calls": 0,
+            "prompt_chars": 0,
+            "stable_prefix_chars": 0,
+            "prefix_breaks": 0,
+            "usage_reports": 0,
+            "input_tokens": 0,
+            "cached_tokens": 0,
+        }
+
+    def observe(self, session_id: str, messages: Sequence[BaseMessage]) -> Dict[str, Any]:
+        """프롬프트 1건 기록 - 직전 턴 대비 유지된 prefix 글자 수 반환"""
+        current = prompt_fingerprint(messages)
+        prompt_chars = sum(length for _, length in current)
+        with self._lock:
+            previous = self._prefixes.get(session_id)
+            self._prefixes[session_id] = current
+            chars, kept = stable_prefix(previous, current) if previous else (0, True)
+            self._stats["calls"] += 1
+            self._stats["prompt_chars"] += prompt_chars
+            self._stats["stable_prefix_chars"] += chars
+            self._stats["prefix_breaks"] += not kept
+        return {"prompt_chars": prompt_chars, "stable_prefix_chars": chars, "prefix_kept": kept}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ):
+        # RunnableWithMessageHistory의 configurable.session_id가 metadata로 전달됨
+        session_id = (metadata or {}).get("session_id")
+        if session_id and messages:
+            self.observe(session_id, messages[0])
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if not usage:
+            return
+        cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        with self._lock:
+            self._stats["usage_reports"] += 1
+            self._stats["input_tokens"] += usage.get("input_tokens", 0)
+            self._stats["cached_tokens"] += cached
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._prefixes.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._stats)
+        data["prefix_stability"] = (
+            round(data["stable_prefix_chars"] / data["prompt_chars"], 4) if data["prompt_chars"] else 0.0
+        )
+        data["cached_token_ratio"] = (
+            round(data["cached_tokens"] / data["input_tokens"], 4) if data["input_tokens"] else 0.0
+        )
+        return data
@@ -0,0 +1,100 @@
+"""
+레시피 감지 - 응답이 레시피인지 판별하고 구조 정보 추출
+- 키워드 전체를 하나의 Aho-Corasick 오토마톤으로 한 번에 스캔
+- 스트리밍 토큰 단위로 누적 판별 (스트림 종료 시점에 결과 확정)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from services.aho_corasick import AhoCorasick
+
+RECIPE_KEYWORDS = ["재료", "만드는 방법", "조리", "손질", "끓이", "볶", "굽", "찌"]
+INGREDIENT_HEADERS = ["재료", "준비물"]
+DEFAULT_RECIPE_NAME = "레시피"
+
+NAME_CLEANUP_PATTERN = re.compile(r"[#*\[\]()]")
+STEP_PATTERN = re.compile(r"^\s*(?:\d+\s*[.)]|step\s*\d+|\d+\s*단계)", re.IGNORECASE)
+
+_KEYWORD_AUTOMATON = AhoCorasick(RECIPE_KEYWORDS)
+
+
+@dataclass
+class RecipeSignals:
+    """레시피 판별 결과"""
+    is_recipe: bool
+    name: str
+    has_ingredients: bool
+    step_count: int
+
+
+def extract_recipe_name(line: str) -> Optional[str]:
+    """응답 앞부분 한 줄에서 요리 이름 추출"""
+    line = line.strip()
+    if not line or line.startswith("-") or line.startswith("*"):
+        return None
+    name = NAME_CLEANUP_PATTERN.sub("", line).strip()
+    if name and len(name) < 50:
+        return name
+    return None
+
+
+class RecipeDetector:
+    """스트리밍 응답용 누적 레시피 감지기"""
+
+    NAME_LINE_LIMIT = 3
+
+    def __init__(self):
+        self._state = 0
+        self._keyword_hit = False
+        self._line_buffer: List[str] = []
+        self._started = False
+        self._line_count = 0
+        self.name: Optional[str] = None
+        self.has_ingredients = False
+        self.step_count = 0
+
+    def feed(self, chunk: str):
+        for char in chunk:
+            if not self._keyword_hit:
+                self._state = _KEYWORD_AUTOMATON.step(self._state, char)
+                if _KEYWORD_AUTOMATON.output[self._state]:
+                    self._keyword_hit = True
+
+            if char == "\n":
+                self._end_line()
+            elif self._started or not char.isspace():
+                self._started = True
+                self._line_buffer.append(char)
+
+    def _end_line(self):
+        line = "".join(self._line_buffer)
+        self._line_buffer.clear()
+        if not self._started:
+            return
+
+        if self.name is None and self._line_count < self.NAME_LINE_LIMIT:
+            self.name = extract_recipe_name(line)
+        self._line_count += 1
+
+        if not self.has_ingredients and any(header in line for header in INGREDIENT_HEADERS):
+            self.has_ingredients = True
+        if STEP_PATTERN.match(line):
+            self.step_count += 1
+
+    def finish(self) -> RecipeSignals:
+        if self._line_buffer:
+            self._end_line()
+        return RecipeSignals(
+            is_recipe=self._keyword_hit,
+            name=self.name or DEFAULT_RECIPE_NAME,
+            has_ingredients=self.has_ingredients,
+            step_count=self.step_count,
+        )
+
+
+def detect_recipe(text: str) -> RecipeSignals:
+    detector = RecipeDetector()
+    detector.feed(text)
+    return detector.finish()
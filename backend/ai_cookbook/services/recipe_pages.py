@@ -0,0 +1,121 @@
+"""
+최종 레시피 정적 페이지 - 확정 시점에 한 번 렌더링해서 디스크에 저장
+- HTML(마크다운 → HTML, templates/recipe.html) + JSON
+- 원본 / gzip / zstd 세 벌을 미리 압축해 저장 (요청마다 압축하지 않음)
+- 파일 이름은 내용 해시 → 내용이 바뀌면 URL도 바뀌므로 영구 캐시 가능
+- 조회는 디스크에서 바로 전송 (ChatService / 세션을 거치지 않음)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+import mistune
+import zstandard
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from config.settings import settings
+
+PAGE_URL_PREFIX = "/recipeChat/pages"
+PAGE_NAME_PATTERN = re.compile(r"^[0-9a-f]{16}\.(html|json)$")
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "json": "application/json"}
+# 선호 순서 (클라이언트가 지원하는 것 중 앞쪽부터)
+ENCODINGS = (("zstd", ".zst"), ("gzip", ".gz"))
+APP_DIR = Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = APP_DIR / "templates"
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Accept-Encoding 헤더 → 허용된 인코딩 (q=0 제외)"""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class RecipePageStore:
+    """내용 해시 이름으로 저장되는 최종 레시피 페이지"""
+
+    def __init__(self, root: str):
+        self.root = APP_DIR / root  # 상대 경로는 작업 디렉터리가 아닌 앱 디렉터리 기준
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+        self._markdown = mistune.create_markdown(escape=True)  # 응답 속 raw HTML은 이스케이프
+        self._compressor = zstandard.ZstdCompressor(level=19)
+        self._lock = threading.Lock()
+
+    def publish(self, view: Dict[str, Any]) -> Dict[str, str]:
+        """최종 레시피 → HTML / JSON 파일, 공유용 URL 반환"""
+        data = {
+            "recipe_name": view["recipe_name"],
+            "recipe_content": view["recipe_content"],
+            "image_prompt": view.get("image_prompt"),
+            "image_url": view.get("image_url"),
+        }
+        json_bytes = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        html_bytes = self._env.get_template("recipe.html").render(
+            recipe_name=data["recipe_name"],
+            image_url=data["image_url"],
+            recipe_html=Markup(self._markdown(data["recipe_content"])),
+        ).encode("utf-8")
+
+        digest = hashlib.sha256(html_bytes + b"\0" + json_bytes).hexdigest()[:16]
+        with self._lock:
+            self._write(f"{digest}.html", html_bytes)
+            self._write(f"{digest}.json", json_bytes)
+        return {
+            "page_url": f"{PAGE_URL_PREFIX}/{digest}.html",
+            "json_url": f"{PAGE_URL_PREFIX}/{digest}.json",
+        }
+
+    def _write(self, name: str, payload: bytes):
+        path = self.root / name
+        if path.exists():
+            return  # 같은 내용은 이미 저장됨
+        variants = [
+            (".zst", self._compressor.compress(payload)),
+            (".gz", gzip.compress(payload, compresslevel=9, mtime=0)),
+            ("", payload),  # 원본을 마지막에 기록 → 원본이 있으면 압축본도 완성된 상태
+        ]
+        for suffix, content in variants:
+            target = path.with_name(name + suffix)
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, target)
+
+    def resolve(self, name: str, accept_encoding: Optional[str]) -> Optional[Tuple[Path, Optional[str], str]]:
+        """요청 파일 이름 → (전송할 파일, Content-Encoding, media type)"""
+        match = PAGE_NAME_PATTERN.match(name)
+        if match is None:
+            return None
+        path = self.root / name
+        if not path.is_file():
+            return None
+        media_type = MEDIA_TYPES[match.group(1)]
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, suffix in ENCODINGS:
+            compressed = path.with_name(name + suffix)
+            if encoding in accepted and compressed.is_file():
+                return compressed, encoding, media_type
+        return path, None, media_type
+
+
+_store: Optional[RecipePageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_recipe_page_store() -> RecipePageStore:
+    """프로세스 공용 페이지 저장소 (ChatService는 기록, 조회 엔드포인트는 읽기만)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RecipePageStore(settings.recipe_pages_dir)
+        return _store
@@ -0,0 +1,239 @@
+"""
+검색 서비스 - Qdrant 검색 튜닝 옵션을 적용한 리트리버
+- payload 필드 선택 (page_content만 받아오기)
+- 쿼리별 HNSW ef, score threshold
+- 양자화 벡터 검색 + 원본 벡터 rescoring
+- 하이브리드 검색: BM25 희소 인덱스 + dense 결과를 RRF로 결합
+- 알러지 청크 제외 (must_not has_id 필터)
+- 배치 검색: 질의 임베딩 1회 + Qdrant 배치 쿼리 1회
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from qdrant_client import QdrantClient, models
+
+from config.settings import settings
+from services.sparse_index import query_tokens
+
+CONTENT_KEY = "page_content"
+METADATA_KEY = "metadata"
+
+
+async def aembed_queries(embeddings: Any, texts: List[str]) -> List[List[float]]:
+    """질의 여러 개를 한 번의 임베딩 요청으로 처리"""
+    if hasattr(embeddings, "async_client") and hasattr(embeddings, "_invocation_params"):
+        # UpstageEmbeddings는 배치 입력을 passage 모델로만 보내므로 query 모델로 직접 호출
+        params = embeddings._invocation_params
+        params["model"] = params["model"] + "-query"
+        response = await embeddings.async_client.create(input=texts, **params)
+        return [item.embedding for item in response.data]
+    return await embeddings.aembed_documents(texts)
+
+
+def create_qdrant_client() -> QdrantClient:
+    """설정 기반 Qdrant 클라이언트 (gRPC 우선)"""
+    return QdrantClient(
+        host=settings.rag_host,
+        port=settings.rag_port,
+        grpc_port=settings.rag_grpc_port,
+        prefer_grpc=settings.rag_prefer_grpc,
+    )
+
+
+class QdrantRetriever(BaseRetriever):
+    """QdrantVectorStore 컬렉션을 직접 조회하는 리트리버"""
+
+    client: Any
+    collection_name: str
+    embeddings: Any
+    k: int = 10
+    payload_fields: Optional[List[str]] = None
+    hnsw_ef: Optional[int] = None
+    score_threshold: Optional[float] = None
+    quantization_rescore: bool = False
+    quantization_oversampling: Optional[float] = None
+    exact: bool = False
+    vector_name: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls, client: QdrantClient, collection_name: str, embeddings: Any) -> "QdrantRetriever":
+        return cls(
+            client=client,
+            collection_name=collection_name,
+            embeddings=embeddings,
+            k=settings.rag_top_k,
+            payload_fields=settings.rag_payload_fields or None,
+            hnsw_ef=settings.rag_hnsw_ef,
+            score_threshold=settings.rag_score_threshold,
+            quantization_rescore=settings.rag_quantization_rescore,
+            quantization_oversampling=settings.rag_quantization_oversampling,
+        )
+
+    def search_params(self) -> Optional[models.SearchParams]:
+        quantization = None
+        if self.quantization_rescore:
+            quantization = models.QuantizationSearchParams(
+                ignore=False,
+                rescore=True,
+                oversampling=self.quantization_oversampling,
+            )
+        if self.hnsw_ef is None and quantization is None and not self.exact:
+            return None
+        return models.SearchParams(
+            hnsw_ef=self.hnsw_ef,
+            exact=self.exact,
+            quantization=quantization,
+        )
+
+    def with_payload(self) -> Any:
+        # 메타데이터까지 통째로 받지 않고 필요한 필드만 projection
+        return list(self.payload_fields) if self.payload_fields else True
+
+    @staticmethod
+    def exclusion_filter(exclude_ids: Optional[Set[Any]]) -> Optional[models.Filter]:
+        if not exclude_ids:
+            return None
+        return models.Filter(must_not=[models.HasIdCondition(has_id=list(exclude_ids))])
+
+    def search_by_vector(
+        self,
+        vector: List[float],
+        k: Optional[int] = None,
+        exclude_ids: Optional[Set[Any]] = None,
+    ) -> List[Document]:
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            using=self.vector_name,
+            query_filter=self.exclusion_filter(exclude_ids),
+            search_params=self.search_params(),
+            limit=k or self.k,
+            with_payload=self.with_payload(),
+            score_threshold=self.score_threshold,
+        )
+        return [self._to_document(point) for point in response.points]
+
+    def search_batch_by_vectors(
+        self,
+        vectors: List[List[float]],
+        k: Optional[int] = None,
+        exclude_ids: Optional[Set[Any]] = None,
+    ) -> List[List[Document]]:
+        """여러 질의를 Qdrant 배치 요청 1회로 검색"""
+        query_filter = self.exclusion_filter(exclude_ids)
+        requests = [
+            models.QueryRequest(
+                query=vector,
+                using=self.vector_name,
+                filter=query_filter,
+                params=self.search_params(),
+                limit=k or self.k,
+                with_payload=self.with_payload(),
+                score_threshold=self.score_threshold,
+            )
+            for vector in vectors
+        ]
+        responses = self.client.query_batch_points(collection_name=self.collection_name, requests=requests)
+        return [[self._to_document(point) for point in response.points] for response in responses]
+
+    def _to_document(self, point: Any) -> Document:
+        payload: Dict[str, Any] = point.payload or {}
+        metadata = dict(payload.get(METADATA_KEY) or {})
+        metadata["_id"] = point.id
+        metadata["_score"] = point.score
+        return Document(page_content=payload.get(CONTENT_KEY, ""), metadata=metadata)
+
+    def search(
+        self,
+        query: str,
+        exclude_ids: Optional[Set[Any]] = None,
+        vector: Optional[List[float]] = None,
+    ) -> List[Document]:
+        vector = vector or self.embeddings.embed_query(query)
+        return self.search_by_vector(vector, exclude_ids=exclude_ids)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        exclude_ids: Optional[Set[Any]] = None,
+    ) -> List[List[Document]]:
+        return self.search_batch_by_vectors(vectors, exclude_ids=exclude_ids)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.search(query)
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[Document]],
+    k: int,
+    rrf_k: int = 60,
+) -> List[Document]:
+    """문서 id 기준 RRF 점수 합산 후 상위 k개"""
+    scores: Dict[Any, float] = {}
+    docs: Dict[Any, Document] = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked):
+            key = doc.metadata.get("_id", doc.page_content)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            docs.setdefault(key, doc)
+    top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [docs[key] for key, _ in top]
+
+
+class HybridRetriever(BaseRetriever):
+    """dense(Qdrant) + sparse(BM25) 하이브리드 리트리버"""
+
+    dense: QdrantRetriever
+    sparse: Any  # BM25Index | LazyBM25Index
+    k: int = 10
+    candidates: int = 20
+    rrf_k: int = 60
+
+    def fuse(
+        self,
+        query: str,
+        dense_docs: List[Document],
+        exclude_ids: Optional[Set[Any]] = None,
+    ) -> List[Document]:
+        if not query_tokens(query):
+            return dense_docs[: self.k]
+        # 제외 청크만큼 여유있게 가져온 뒤 걸러냄
+        limit = self.candidates + (len(exclude_ids) if exclude_ids else 0)
+        sparse_docs = [
+            doc for doc, _ in self.sparse.search(query, limit)
+            if not exclude_ids or doc.metadata.get("_id") not in exclude_ids
+        ][: self.candidates]
+        return reciprocal_rank_fusion([dense_docs, sparse_docs], self.k, self.rrf_k)
+
+    def search(
+        self,
+        query: str,
+        exclude_ids: Optional[Set[Any]] = None,
+        vector: Optional[List[float]] = None,
+    ) -> List[Document]:
+        vector = vector or self.dense.embeddings.embed_query(query)
+        dense_docs = self.dense.search_by_vector(vector, k=self.candidates, exclude_ids=exclude_ids)
+        return self.fuse(query, dense_docs, exclude_ids)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        vectors: List[List[float]],
+        exclude_ids: Optional[Set[Any]] = None,
+    ) -> List[List[Document]]:
+        dense_results = self.dense.search_batch_by_vectors(vectors, k=self.candidates, exclude_ids=exclude_ids)
+        return [
+            self.fuse(query, dense_docs, exclude_ids)
+            for query, dense_docs in zip(queries, dense_results)
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.search(query)
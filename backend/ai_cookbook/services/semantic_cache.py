@@ -0,0 +1,131 @@
+"""
+의미 기반 응답 캐시 - 비슷한 질문(paraphrase)에 대한 이전 답변 재사용
+- 프로필(알러지 / 특이사항 / 레벨) + 직전 레시피 지문은 정확히 일치해야 함 (알러지가 다른 사용자와 절대 공유하지 않음)
+- 그 안에서 질문 임베딩의 코사인 유사도가 임계값 이상이면 히트
+- TTL + LRU 제거, 히트 / 미스 / 오탐 지표
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] if text else "-"
+
+
+def cache_key(
+    allergies: Iterable[str],
+    preferences: str,
+    cooking_level: str,
+    last_recipe: str = "",
+) -> str:
+    """정확히 일치해야 하는 파티션 키"""
+    allergy_part = ",".join(sorted({a.strip() for a in allergies if a.strip()}))
+    return "|".join([
+        fingerprint(allergy_part),
+        fingerprint(preferences.strip()),
+        cooking_level,
+        fingerprint(last_recipe),
+    ])
+
+
+@dataclass
+class CacheEntry:
+    entry_id: int
+    key: str
+    vector: np.ndarray
+    message: str
+    response: str
+    created_at: float
+
+
+class SemanticCache:
+    """파티션별 로컬 벡터 인덱스 (코사인 유사도 선형 스캔)"""
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: float = 3600, max_entries: int = 5000):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._partitions: Dict[str, Dict[int, CacheEntry]] = {}
+        self._lru: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "false_hits": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _remove(self, entry: CacheEntry):
+        self._lru.pop(entry.entry_id, None)
+        partition = self._partitions.get(entry.key)
+        if partition is not None:
+            partition.pop(entry.entry_id, None)
+            if not partition:
+                del self._partitions[entry.key]
+
+    def lookup(self, key: str, vector: List[float]) -> Optional[CacheEntry]:
+        query = self._normalize(vector)
+        now = time.time()
+        with self._lock:
+            partition = self._partitions.get(key, {})
+            expired = [e for e in partition.values() if now - e.created_at > self.ttl_seconds]
+            for entry in expired:
+                self._remove(entry)
+            self._stats["expired"] += len(expired)
+
+            entries = list(self._partitions.get(key, {}).values())
+            if entries:
+                scores = np.stack([e.vector for e in entries]) @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    entry = entries[best]
+                    self._lru.move_to_end(entry.entry_id)
+                    self._stats["hits"] += 1
+                    return entry
+
+            self._stats["misses"] += 1
+            return None
+
+    def store(self, key: str, vector: List[float], message: str, response: str):
+        with self._lock:
+            entry = CacheEntry(
+                entry_id=next(self._ids),
+                key=key,
+                vector=self._normalize(vector),
+                message=message,
+                response=response,
+                created_at=time.time(),
+            )
+            self._partitions.setdefault(key, {})[entry.entry_id] = entry
+            self._lru[entry.entry_id] = entry
+            while len(self._lru) > self.max_entries:
+                _, oldest = self._lru.popitem(last=False)
+                self._remove(oldest)
+                self._stats["evicted"] += 1
+
+    def reject(self, entry: CacheEntry):
+        """히트했지만 재검증에 실패한 항목 - 오탐으로 집계 후 제거"""
+        with self._lock:
+            # lookup에서 히트로 집계된 것을 되돌림
+            self._stats["hits"] -= 1
+            self._stats["misses"] += 1
+            self._stats["false_hits"] += 1
+            self._remove(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._stats)
+            data["size"] = len(self._lru)
+        total = data["hits"] + data["misses"]
+        data["hit_rate"] = round(data["hits"] / total, 4) if total else 0.0
+        return data
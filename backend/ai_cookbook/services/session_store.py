@@ -0,0 +1,248 @@
+"""
+세션 저장소 - 메모리 효율적인 세션 표현
+- 메시지는 append-only 버퍼에 저장, 오래된 턴은 zstd 블록으로 압축
+- 레시피 본문은 복사하지 않고 메시지 인덱스로 참조
+- LangChain 히스토리 인터페이스는 필요할 때만 메시지 객체로 변환
+- 히스토리 API 응답용 직렬화 결과는 압축 블록 단위로 프로세스 공용 LRU에 캐시
+"""
+
+import json
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import zstandard
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+ROLE_USER = 0
+ROLE_ASSISTANT = 1
+ROLE_NAMES = ("user", "assistant")
+
+_HEADER = struct.Struct("<BI")
+_local = threading.local()
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # zstd 컨텍스트는 스레드 간 공유 불가 - 스레드별로 재사용
+    if not hasattr(_local, "compressor"):
+        _local.compressor = zstandard.ZstdCompressor(level=3)
+    return _local.compressor
+
+
+def _decompressor() -> zstandard.ZstdDecompressor:
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def _encode_block(messages: Sequence[Tuple[int, str]]) -> bytes:
+    parts = []
+    for role, text in messages:
+        data = text.encode("utf-8")
+        parts.append(_HEADER.pack(role, len(data)))
+        parts.append(data)
+    return _compressor().compress(b"".join(parts))
+
+
+def _decode_block(frame: bytes) -> List[Tuple[int, str]]:
+    raw = _decompressor().decompress(frame)
+    messages, offset = [], 0
+    while offset < len(raw):
+        role, length = _HEADER.unpack_from(raw, offset)
+        offset += _HEADER.size
+        messages.append((role, raw[offset:offset + length].decode("utf-8")))
+        offset += length
+    return messages
+
+
+class MessageBuffer:
+    """append-only 메시지 버퍼 (최근 메시지는 원문, 오래된 메시지는 압축 블록)
+    - 쓰기(채팅 턴, 스레드풀)와 읽기(히스토리 조회, 이벤트 루프)가 겹칠 수 있어
+      블록 이동은 락 안에서, 읽기는 락 안에서 뜬 스냅샷으로 처리"""
+
+    __slots__ = ("_frames", "_frame_ends", "_hot", "_lock", "hot_limit", "block_size", "generation")
+
+    def __init__(self, hot_limit: int = 6, block_size: int = 4):
+        self._frames: List[bytes] = []
+        self._frame_ends = array("I")  # 블록별 누적 메시지 수
+        self._hot: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self.hot_limit = hot_limit
+        self.block_size = block_size
+        self.generation = 0  # clear() 할 때마다 증가 (append-only 가정이 깨지는 유일한 경우)
+
+    def _snapshot(self) -> Tuple[int, List[bytes], List[int], List[Tuple[int, str]]]:
+        with self._lock:
+            return self.generation, list(self._frames), list(self._frame_ends), list(self._hot)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (self._frame_ends[-1] if self._frame_ends else 0) + len(self._hot)
+
+    def append(self, role: int, text: str):
+        with self._lock:
+            self._hot.append((role, text))
+            if len(self._hot) >= self.hot_limit + self.block_size:
+                block = self._hot[: self.block_size]
+                compressed = self._frame_ends[-1] if self._frame_ends else 0
+                self._frames.append(_encode_block(block))
+                self._frame_ends.append(compressed + len(block))
+                del self._hot[: self.block_size]
+
+    def __getitem__(self, index: int) -> Tuple[int, str]:
+        _, frames, ends, hot = self._snapshot()
+        compressed = ends[-1] if ends else 0
+        if index < 0:
+            index += compressed + len(hot)
+        if not 0 <= index < compressed + len(hot):
+            raise IndexError(index)
+        if index >= compressed:
+            return hot[index - compressed]
+        start = 0
+        for frame, end in zip(frames, ends):
+            if index < end:
+                return _decode_block(frame)[index - start]
+            start = end
+        raise IndexError(index)
+
+    def iter_from(self, start: int = 0) -> Iterator[Tuple[int, str]]:
+        """start 위치부터 순회 (필요한 블록만 압축 해제)"""
+        _, frames, ends, hot = self._snapshot()
+        begin = 0
+        for frame, end in zip(frames, ends):
+            if start < end:
+                block = _decode_block(frame)
+                yield from block[max(start - begin, 0):]
+            begin = end
+        compressed = ends[-1] if ends else 0
+        yield from hot[max(start - compressed, 0):]
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        return self.iter_from(0)
+
+    def clear(self):
+        with self._lock:
+            self._frames = []
+            self._frame_ends = array("I")
+            self._hot = []
+            self.generation += 1
+
+
+def _serialize(role: int, text: str) -> bytes:
+    return json.dumps({"role": ROLE_NAMES[role], "content": text}, ensure_ascii=False).encode("utf-8")
+
+
+class HistoryCache:
+    """히스토리 API용 JSON 직렬화 캐시 (프로세스 공용)
+    - 압축 블록은 바뀌지 않으므로 블록 단위로 직렬화 결과를 캐시 (clear()는 generation으로 구분)
+    - 최근 메시지(hot)는 몇 개 되지 않아 매번 직렬화
+    - 블록 수 기준 LRU → 오래 조회되지 않은 세션의 캐시는 자연스럽게 밀려남"""
+
+    def __init__(self, max_blocks: int = 1024):
+        self.max_blocks = max_blocks
+        self._blocks: "OrderedDict[Tuple[str, int, int], List[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _block(self, key: Tuple[str, int, int], frame: bytes) -> List[bytes]:
+        with self._lock:
+            items = self._blocks.get(key)
+            if items is not None:
+                self._blocks.move_to_end(key)
+                return items
+        items = [_serialize(role, text) for role, text in _decode_block(frame)]
+        with self._lock:
+            self._blocks[key] = items
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        return items
+
+    def page(
+        self,
+        session_id: str,
+        buffer: MessageBuffer,
+        start: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[bytes], int]:
+        """[start, start + limit) 구간의 직렬화된 항목과 전체 메시지 수"""
+        generation, frames, ends, hot = buffer._snapshot()
+        compressed = ends[-1] if ends else 0
+        total = compressed + len(hot)
+        start = min(start, total)
+        end = total if limit is None else min(start + limit, total)
+
+        items: List[bytes] = []
+        begin = 0
+        for block_no, (frame, block_end) in enumerate(zip(frames, ends)):
+            if start < block_end and begin < end:
+                block = self._block((session_id, generation, block_no), frame)
+                items.extend(block[max(start - begin, 0):end - begin])
+            begin = block_end
+        for role, text in hot[max(start - compressed, 0):max(end - compressed, 0)]:
+            items.append(_serialize(role, text))
+        return items, total
+
+    def discard(self, session_id: str):
+        with self._lock:
+            for key in [key for key in self._blocks if key[0] == session_id]:
+                del self._blocks[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"blocks": len(self._blocks), "max_blocks": self.max_blocks}
+
+
+@dataclass(slots=True)
+class SessionRecord:
+    """세션 1개 = 프로필 + 메시지 버퍼 + 레시피 인덱스"""
+
+    allergy: List[str]
+    preferences: str
+    cooking_level: str
+    food_type: str
+    is_finalized: bool = False
+    messages: MessageBuffer = field(default_factory=MessageBuffer)
+    recipe_messages: array = field(default_factory=lambda: array("I"))  # 레시피 응답의 메시지 위치
+    recipe_name: str = ""
+    recipe_has_ingredients: bool = False
+    recipe_step_count: int = 0
+    allergen_warnings: List[Dict[str, str]] = field(default_factory=list)
+    final: Optional[Dict[str, Any]] = None  # 확정 레시피 (본문은 recipe_index로 참조)
+
+    @property
+    def last_recipe_index(self) -> Optional[int]:
+        return self.recipe_messages[-1] if self.recipe_messages else None
+
+    def last_recipe_content(self) -> Optional[str]:
+        index = self.last_recipe_index
+        return self.messages[index][1] if index is not None else None
+
+    @property
+    def history_version(self) -> str:
+        """히스토리 / 세션 정보가 바뀔 때만 달라지는 버전 (ETag용)"""
+        return f"{self.messages.generation}.{len(self.messages)}.{int(self.is_finalized)}"
+
+
+def _to_message(role: int, text: str) -> BaseMessage:
+    return HumanMessage(content=text) if role == ROLE_USER else AIMessage(content=text)
+
+
+class CompactChatHistory(BaseChatMessageHistory):
+    """MessageBuffer를 LangChain 히스토리 인터페이스로 감싸는 어댑터"""
+
+    def __init__(self, buffer: MessageBuffer):
+        self.buffer = buffer
+
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore[override]
+        return [_to_message(role, text) for role, text in self.buffer]
+
+    def add_message(self, message: BaseMessage):
+        role = ROLE_USER if message.type == "human" else ROLE_ASSISTANT
+        self.buffer.append(role, message.content if isinstance(message.content, str) else str(message.content))
+
+    def clear(self):
+        self.buffer.clear()
@@ -0,0 +1,151 @@
+"""
+희소 인덱스 - 레시피 코퍼스용 BM25 역색인
+- 한국어 토크나이저: 조사 제거 + 음절 bigram
+- "양파는 빼고" 같은 제외 표현은 질의 토큰에서 제거
+"""
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-zA-Z]+|\d+")
+
+# 긴 조사부터 매칭해야 "에서"가 "에"로 잘리지 않음
+JOSA = sorted(
+    ["은", "는", "이", "가", "을", "를", "에", "에서", "으로", "로", "와", "과",
+     "도", "만", "의", "하고", "랑", "이랑", "처럼", "보다", "까지", "부터"],
+    key=len,
+    reverse=True,
+)
+
+EXCLUDE_PATTERN = re.compile(r"([가-힣]+?)(?:은|는|을|를|이|가)?\s*(?:빼|제외|없이|말고)")
+
+
+def _strip_josa(word: str) -> str:
+    for josa in JOSA:
+        if len(word) > len(josa) + 1 and word.endswith(josa):
+            return word[: -len(josa)]
+    return word
+
+
+def tokenize_korean(text: str) -> List[str]:
+    """어절 단위 어간 + 음절 bigram 토큰"""
+    tokens: List[str] = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if not ("가" <= word[0] <= "힣"):
+            tokens.append(word)
+            continue
+        stem = _strip_josa(word)
+        tokens.append(stem)
+        # 띄어쓰기 / 합성어 차이 보완 ("김치찌개" ↔ "김치 찌개")
+        if len(stem) > 2:
+            tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+    return tokens
+
+
+def extract_excluded_terms(query: str) -> Set[str]:
+    """'양파는 빼고', '마늘 없이' 등에서 제외 재료 추출"""
+    return {match.group(1) for match in EXCLUDE_PATTERN.finditer(query)}
+
+
+def query_tokens(query: str) -> List[str]:
+    excluded = extract_excluded_terms(query)
+    if not excluded:
+        return tokenize_korean(query)
+    excluded_tokens = set(tokenize_korean(" ".join(excluded)))
+    return [token for token in tokenize_korean(query) if token not in excluded_tokens]
+
+
+class BM25Index:
+    """메모리 역색인 기반 BM25"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths: List[int] = []
+        self.avg_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_documents(self, documents: Iterable[Document]):
+        for doc in documents:
+            doc_idx = len(self.documents)
+            counts = Counter(tokenize_korean(doc.page_content))
+            for token, tf in counts.items():
+                self.postings[token].append((doc_idx, tf))
+            self.documents.append(doc)
+            self.doc_lengths.append(sum(counts.values()))
+        if self.doc_lengths:
+            self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Document, float]]:
+        n_docs = len(self.documents)
+        if not n_docs:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(query_tokens(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_idx, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_idx] / self.avg_length)
+                scores[doc_idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.documents[doc_idx], score) for doc_idx, score in top]
+
+    @classmethod
+    def from_qdrant(
+        cls,
+        client: Any,
+        collection_name: str,
+        content_key: str = "page_content",
+        batch_size: int = 256,
+    ) -> "BM25Index":
+        """Qdrant 컬렉션 payload를 스크롤하며 인덱스 구축"""
+        index = cls()
+        offset: Optional[Any] = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=[content_key],
+                with_vectors=False,
+            )
+            index.add_documents(
+                Document(page_content=(r.payload or {}).get(content_key, ""), metadata={"_id": r.id})
+                for r in records
+            )
+            if offset is None:
+                break
+        return index
+
+
+class LazyBM25Index:
+    """첫 검색 시점에 Qdrant에서 인덱스를 구축"""
+
+    def __init__(self, client: Any, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        self._index: Optional[BM25Index] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> BM25Index:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = BM25Index.from_qdrant(self.client, self.collection_name)
+        return self._index
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Document, float]]:
+        return self.get().search(query, k)
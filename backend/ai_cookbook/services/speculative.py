@@ -0,0 +1,111 @@
+"""
+투기적 사전 확정 - 레시피 응답이 나오는 즉시 최종 레시피 / 이미지 작업을 미리 수행
+- 세션별 버전 번호로 이전 작업을 무효화 (새 레시피 응답이 오면 대체)
+- 이미지 작업은 별도 단일 워커에서 낮은 우선순위로 실행
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeFinalizer:
+    """세션별 최종 레시피 사전 계산"""
+
+    def __init__(
+        self,
+        build_record: Callable[[str, int, str], Dict[str, Any]],
+        image_job: Optional[Callable[[str], str]] = None,
+        workers: int = 2,
+        on_image: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        self.build_record = build_record
+        self.image_job = image_job
+        self.on_image = on_image
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculative")
+        self._image_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-image")
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._futures: Dict[str, List[Future]] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"submitted": 0, "superseded": 0, "used": 0, "missed": 0, "image_done": 0, "image_failed": 0}
+
+    def submit(self, session_id: str, recipe_name: str, recipe_index: int, recipe_content: str):
+        """새 레시피 응답 - 이전 작업을 취소하고 새로 계산"""
+        with self._lock:
+            version = self._versions.get(session_id, 0) + 1
+            self._versions[session_id] = version
+            previous = self._futures.pop(session_id, [])
+            if previous:
+                self._stats["superseded"] += 1
+            for future in previous:
+                future.cancel()
+            self._records.pop(session_id, None)
+            self._stats["submitted"] += 1
+            self._futures[session_id] = [
+                self._executor.submit(self._prepare, session_id, version, recipe_name, recipe_index, recipe_content)
+            ]
+
+    def _is_current(self, session_id: str, version: int) -> bool:
+        return self._versions.get(session_id) == version
+
+    def _prepare(self, session_id: str, version: int, recipe_name: str, recipe_index: int, recipe_content: str):
+        record = self.build_record(recipe_name, recipe_index, recipe_content)
+        with self._lock:
+            if not self._is_current(session_id, version):
+                return
+            self._records[session_id] = record
+            if self.image_job is not None:
+                self._futures[session_id].append(
+                    self._image_executor.submit(self._warm_image, session_id, version, record["image_prompt"])
+                )
+
+    def _warm_image(self, session_id: str, version: int, image_prompt: str):
+        with self._lock:
+            if not self._is_current(session_id, version):
+                return
+        try:
+            image_url = self.image_job(image_prompt)
+        except Exception as e:
+            logger.warning(f"Speculative image job failed: {e}")
+            with self._lock:
+                self._stats["image_failed"] += 1
+            return
+        with self._lock:
+            self._stats["image_done"] += 1
+            record = self._records.get(session_id) if self._is_current(session_id, version) else None
+            if record is not None:
+                record["image_url"] = image_url
+        if record is not None and self.on_image is not None:
+            self.on_image(session_id, record)
+
+    def take(self, session_id: str, recipe_index: int) -> Optional[Dict[str, Any]]:
+        """확정 시점 - 같은 레시피로 미리 계산된 결과가 있으면 반환
+        (같은 dict를 공유하므로 확정 후 끝난 이미지 작업 결과도 반영됨)"""
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None or record["recipe_index"] != recipe_index:
+                self._stats["missed"] += 1
+                return None
+            self._stats["used"] += 1
+            return record
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._versions.pop(session_id, None)
+            self._records.pop(session_id, None)
+            for future in self._futures.pop(session_id, []):
+                future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._stats)
+            data["pending_jobs"] = sum(not f.done() for fs in self._futures.values() for f in fs)
+        return data
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._image_executor.shutdown(wait=False, cancel_futures=True)
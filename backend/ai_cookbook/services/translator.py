@@ -2,6 +2,22 @@ from abc import ABC, abstractmethod
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from config.settings import settings
+from services.http_client import get_async_http_client, get_http_client
+from services.llm_scheduler import PRIORITY_BACKGROUND, get_llm_scheduler
+
+
+def create_translator_model() -> ChatOpenAI:
+    """번역기용 ChatOpenAI (공유 HTTP 커넥션 풀 사용)"""
+    return ChatOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.endpoint_url or None,
+        model=settings.deployment_name,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        max_retries=0,
+    )
+
 
 class Translator(ABC):
     def __init__(self, model: ChatOpenAI):
@@ -15,9 +31,10 @@ class Translator(ABC):
 class EnglishTranslator(Translator):
     async def translate(self, text: str) -> str:
         try:
-            response = await self.model.ainvoke([
-                HumanMessage(content=f"Please translate to English only: {text}")
-            ])
+            async with get_llm_scheduler().aslot(PRIORITY_BACKGROUND):
+                response = await self.model.ainvoke([
+                    HumanMessage(content=f"Please translate to English only: {text}")
+                ])
             return response.content.strip()
         except Exception as e:
             print(f"Translation failed: {e}")
@@ -27,10 +44,11 @@ class EnglishTranslator(Translator):
 class KoreanTranslator(Translator):
     async def translate(self, text: str) -> str:
         try:
-            response = await self.model.ainvoke([
-                SystemMessage(content="Korean recipe translator"),
-                HumanMessage(content=f"Translate to Korean recipe style: {text}")
-            ])
+            async with get_llm_scheduler().aslot(PRIORITY_BACKGROUND):
+                response = await self.model.ainvoke([
+                    SystemMessage(content="Korean recipe translator"),
+                    HumanMessage(content=f"Translate to Korean recipe style: {text}")
+                ])
             return response.content.strip()
         except Exception as e:
             print(f"Translation failed: {e}")
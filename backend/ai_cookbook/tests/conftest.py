@@ -0,0 +1,13 @@
+import os
+
+# 필수 설정 값 - 테스트는 가짜 모델과 인메모리 Qdrant만 사용 (외부 호출 없음)
+for key, value in {
+    "LLM_API_KEY": "test",
+    "LLM_BASE_URL": "http://127.0.0.1:9/v1",
+    "LLM_MODEL": "test",
+    "EMBEDDING_MODEL": "test",
+    "EMBEDDING_API_KEY": "test",
+    "EMBEDDING_BASE_URL": "http://127.0.0.1:9/v1",
+    "RAG_COLLECTION_NAME": "test",
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,53 @@
+from services.allergen import AllergenIndex, AllergenScanner, expand_allergies, parse_allergies
+
+
+def terms(warnings):
+    return {warning["term"] for warning in warnings}
+
+
+def test_parse_allergies():
+    assert parse_allergies("땅콩, 갑각류") == ["땅콩", "갑각류"]
+    assert parse_allergies(["우유", " ", "없음"]) == ["우유"]
+    assert parse_allergies("없음") == []
+    assert parse_allergies(None) == []
+
+
+def test_parse_allergies_keeps_spaced_entries():
+    assert parse_allergies("갑각류 알레르기") == ["갑각류"]
+    assert parse_allergies("땅콩 버터 / 새우") == ["땅콩 버터", "새우"]
+    expanded = expand_allergies(parse_allergies("땅콩 버터"))
+    assert "버터" not in expanded and "치즈" not in expanded
+    assert AllergenScanner(parse_allergies("갑각류 알레르기")).scan("알레르기가 있다면 알려주세요") == []
+
+
+def test_expand_keeps_single_char_input():
+    expanded = expand_allergies(["굴"])
+    assert expanded["굴"] == "굴"
+    assert "굴소스" in expanded
+    assert "게" in expand_allergies(["게"])
+
+
+def test_scan_ignores_unrelated_negation_words():
+    text = "1. 팬에 버터를 녹이고 타지 않게 밥을 볶아주세요.\n2. 소금 대신 간장을 넣어주세요."
+    assert terms(AllergenScanner(["우유", "대두"]).scan(text)) == {"버터", "간장"}
+    assert terms(AllergenScanner(["땅콩"]).scan("양념: 타지 않게 볶은 땅콩 30g")) == {"땅콩"}
+
+
+def test_scan_skips_negation_attached_to_term():
+    scanner = AllergenScanner(["땅콩", "우유"])
+    assert scanner.scan("땅콩은 빼고 만들었어요.\n우유 없이 두유로 대체했어요.") == []
+    assert terms(scanner.scan("우유 없이, 땅콩을 올려주세요.")) == {"땅콩"}
+
+
+def test_scan_single_char_on_word_boundary():
+    assert terms(AllergenScanner(["굴"]).scan("재료: 굴 200g")) == {"굴"}
+    assert terms(AllergenScanner(["굴"]).scan("굴을 씻어주세요")) == {"굴"}
+    assert AllergenScanner(["굴"]).scan("굴비를 굽고 맛있게 드세요") == []
+    assert AllergenScanner(["게"]).scan("맛있게 익혀주세요") == []
+    assert terms(AllergenScanner(["견과류"]).scan("잣 한 줌")) == {"잣"}
+
+
+def test_index_excludes_single_char_input():
+    index = AllergenIndex()
+    index.add_documents([(1, "굴국밥 재료 굴 200g"), (2, "굴비구이 재료 굴비"), (3, "된장찌개 재료 된장 두부")])
+    assert index.excluded_ids(["굴"]) == {1}
@@ -0,0 +1,63 @@
+from typing import Any, List
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+
+from benchmarks.bench_batch import make_service
+from config.settings import settings
+from services.prompt_layout import LAYOUT_PREFIX_CACHE
+
+QUESTIONS = ["좀 더 맵게 해줘", "양파는 빼고 만들어줘", "2인분으로 바꿔줘", "더 간단하게 알려줘", "곁들일 반찬도 알려줘"]
+
+
+def tokenize(text: str) -> List[int]:
+    # 바이트 단위 토큰 - BPE 토큰 prefix의 하한 (오프라인에서도 동일한 결과)
+    return list(text.encode("utf-8"))
+
+
+def render(prompt) -> List[List[int]]:
+    """chat 템플릿처럼 역할 헤더 + 본문을 메시지 순서대로 토큰화"""
+    return [tokenize(f"<|{role}|>\n{text}\n") for role, text in prompt]
+
+
+def common_prefix(before: List[int], after: List[int]) -> int:
+    length = 0
+    for a, b in zip(before, after):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+class PromptRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.prompts = []
+
+    def on_chat_model_start(self, serialized, messages, **kwargs: Any):
+        self.prompts.append([(m.type, str(m.content)) for m in messages[0]])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "rag_prompt_layout", LAYOUT_PREFIX_CACHE)
+    service = make_service(0, 0)
+    yield service
+    service.close()
+
+
+def test_token_prefix_grows_across_turns(service):
+    recorder = PromptRecorder()
+    service.llm.callbacks = [*service.llm.callbacks, recorder]
+    session_id = service.init_session("땅콩, 새우", "매운 음식 선호, 고수 싫어함", "beginner", "김치찌개")["session_id"]
+    for question in QUESTIONS:
+        service.chat(session_id, question)
+
+    assert len(recorder.prompts) == len(QUESTIONS) + 1
+    last_prefix = 0
+    for previous, current in zip(recorder.prompts, recorder.prompts[1:]):
+        before, after = render(previous), render(current)
+        prefix = common_prefix(sum(before, []), sum(after, []))
+        # 직전 프롬프트에서 마지막(질문 + 검색 컨텍스트) 메시지를 뺀 부분은 전부 재사용 가능해야 함
+        assert prefix >= sum(len(tokens) for tokens in before[:-1])
+        assert prefix >= last_prefix
+        last_prefix = prefix
@@ -0,0 +1,98 @@
+import type { AllergenWarning, FinalRecipeResponse } from "./recipeApi";
+
+// ============ 타입 정의 ============
+
+export type ChatSocketEvent =
+  | { type: "accepted"; id: string }
+  | { type: "chunk"; id: string; chunk: string }
+  | { type: "done"; id: string; is_recipe: boolean; allergen_warnings: AllergenWarning[] }
+  | { type: "cancelled"; id: string }
+  | { type: "error"; id?: string | null; detail: string }
+  | ({ type: "finalized" } & Omit<FinalRecipeResponse, "session_id" | "is_finalized">)
+  | { type: "image"; recipe_name: string; image_url: string | null }
+  | { type: "pong" };
+
+export interface TurnHandlers {
+  onChunk?: (chunk: string) => void;
+  onDone?: (event: Extract<ChatSocketEvent, { type: "done" }>) => void;
+  onCancelled?: () => void;
+  onError?: (detail: string) => void;
+}
+
+// ============ WebSocket 클라이언트 ============
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+
+// 세션당 연결 1개로 여러 턴을 주고받는 채팅 클라이언트
+export class ChatSocket {
+  private socket: WebSocket;
+  private turns = new Map<string, TurnHandlers>();
+  private counter = 0;
+  private ready: Promise<void>;
+
+  // finalize / image 같은 세션 이벤트
+  onEvent?: (event: ChatSocketEvent) => void;
+
+  constructor(sessionId: string, baseUrl: string = API_BASE_URL) {
+    const url = `${baseUrl.replace(/^http/, "ws")}/recipeChat/ws/${sessionId}`;
+    this.socket = new WebSocket(url);
+    this.ready = new Promise((resolve, reject) => {
+      this.socket.addEventListener("open", () => resolve(), { once: true });
+      this.socket.addEventListener("close", (e) => reject(new Error(e.reason || "WebSocket 연결 실패")), {
+        once: true,
+      });
+    });
+    this.socket.addEventListener("message", (e) => this.dispatch(JSON.parse(e.data)));
+  }
+
+  private dispatch(event: ChatSocketEvent) {
+    const handlers = "id" in event && event.id ? this.turns.get(event.id) : undefined;
+    if (!handlers) {
+      this.onEvent?.(event);
+      return;
+    }
+    switch (event.type) {
+      case "chunk":
+        handlers.onChunk?.(event.chunk);
+        break;
+      case "done":
+        this.turns.delete(event.id);
+        handlers.onDone?.(event);
+        break;
+      case "cancelled":
+        this.turns.delete(event.id);
+        handlers.onCancelled?.();
+        break;
+      case "error":
+        this.turns.delete(event.id!);
+        handlers.onError?.(event.detail);
+        break;
+    }
+  }
+
+  private async send(data: Record<string, unknown>) {
+    await this.ready;
+    this.socket.send(JSON.stringify(data));
+  }
+
+  // 턴 전송 - 반환된 id로 취소 가능
+  async sendMessage(message: string, handlers: TurnHandlers): Promise<string> {
+    const id = `t${++this.counter}`;
+    this.turns.set(id, handlers);
+    await this.send({ type: "chat", id, message });
+    return id;
+  }
+
+  async cancel(turnId: string) {
+    await this.send({ type: "cancel", id: turnId });
+  }
+
+  // 결과는 onEvent의 "finalized" 이벤트로 전달
+  async finalize(confirmation?: string) {
+    await this.send({ type: "finalize", id: `f${++this.counter}`, user_confirmation: confirmation || "" });
+  }
+
+  close() {
+    this.socket.close();
+  }
+}
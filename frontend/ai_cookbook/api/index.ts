@@ -1,5 +1,6 @@
 // API 클라이언트
 export { recipeApi, default as RecipeApiClient } from "./recipeApi";
+export { ChatSocket } from "./chatSocket";
 
 // 타입 정의
 export type {
@@ -9,10 +10,12 @@ export type {
   ChatResponse,
   ChatHistoryItem,
   ChatHistoryResponse,
+  ChatHistoryOptions,
   SessionInfo,
   FinalRecipeRequest,
   FinalRecipeResponse,
 } from "./recipeApi";
+export type { ChatSocketEvent, TurnHandlers } from "./chatSocket";
 
 // React 훅
 export { useInitSession, useRecipeChat, useFinalRecipe } from "./useRecipeChat";
\ No newline at end of file
@@ -19,10 +19,17 @@ export interface ChatRequest {
   message: string;
 }
 
+export interface AllergenWarning {
+  allergy: string;
+  term: string;
+  line: string;
+}
+
 export interface ChatResponse {
   session_id: string;
   response: string;
   is_recipe: boolean;
+  allergen_warnings: AllergenWarning[];
 }
 
 export interface ChatHistoryItem {
@@ -30,11 +37,6 @@ export interface ChatHistoryItem {
   content: string;
 }
 
-export interface ChatHistoryResponse {
-  session_id: string;
-  history: ChatHistoryItem[];
-}
-
 export interface SessionInfo {
   allergy: string[];
   preferences: string;
@@ -43,6 +45,21 @@ export interface SessionInfo {
   is_finalized: boolean;
 }
 
+export interface ChatHistoryResponse {
+  session_id: string;
+  history: ChatHistoryItem[];
+  total: number;
+  next_cursor: number; // 다음 요청의 since 값
+  has_more: boolean;
+  info: SessionInfo | null; // includeInfo: true일 때만
+}
+
+export interface ChatHistoryOptions {
+  since?: number;
+  limit?: number;
+  includeInfo?: boolean;
+}
+
 // 3페이지: 최종 레시피
 export interface FinalRecipeRequest {
   user_confirmation?: string;
@@ -53,6 +70,9 @@ export interface FinalRecipeResponse {
   recipe_name: string;
   recipe_content: string;
   image_prompt: string;
+  image_url?: string | null;
+  page_url?: string | null; // 공유용 정적 페이지 (내용 해시 URL)
+  json_url?: string | null;
   is_finalized: boolean;
 }
 
@@ -108,8 +128,19 @@ class RecipeApiClient {
     });
   }
 
-  async getChatHistory(sessionId: string): Promise<ChatHistoryResponse> {
-    return this.request<ChatHistoryResponse>(`/chat/${sessionId}/history`);
+  // 브라우저 HTTP 캐시가 ETag로 재검증 (변경 없으면 304 → 캐시된 응답 사용)
+  async getChatHistory(
+    sessionId: string,
+    options: ChatHistoryOptions = {}
+  ): Promise<ChatHistoryResponse> {
+    const params = new URLSearchParams();
+    if (options.since) params.set("since", String(options.since));
+    if (options.limit) params.set("limit", String(options.limit));
+    if (options.includeInfo) params.set("include_info", "true");
+    const query = params.toString();
+    return this.request<ChatHistoryResponse>(
+      `/chat/${sessionId}/history${query ? `?${query}` : ""}`
+    );
   }
 
   async getSessionInfo(sessionId: string): Promise<SessionInfo> {
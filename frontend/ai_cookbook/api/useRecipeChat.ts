@@ -71,12 +71,9 @@ export function useRecipeChat(sessionId: string | null): UseRecipeChatReturn {
     try {
       setIsLoading(true);
 
-      // 세션 정보 로드
-      const info = await recipeApi.getSessionInfo(sessionId);
-      setSessionInfo(info);
-
-      // 채팅 히스토리 로드
-      const historyResponse = await recipeApi.getChatHistory(sessionId);
+      // 세션 정보 + 채팅 히스토리를 한 번에 로드
+      const historyResponse = await recipeApi.getChatHistory(sessionId, { includeInfo: true });
+      setSessionInfo(historyResponse.info);
       setMessages(historyResponse.history);
     } catch (err) {
       const message = err instanceof Error ? err.message : "히스토리 로드 실패";